@@ -64,12 +64,17 @@ class RuleBasedClassifier:
             # Get email data for classification
             email_data = email.get_classification_data()
 
+            # Fold case once per email rather than once per category in every scorer
+            scoring_data = email_data
+            if not self.config.global_settings.case_sensitive:
+                scoring_data = {key: value.lower() for key, value in email_data.items()}
+
             # Calculate scores for each category
             category_scores = {}
             detailed_scores = {}
 
             for category_name, category_config in self.config.categories.items():
-                score, score_details = self._calculate_category_score(email_data, category_config)
+                score, score_details = self._calculate_category_score(scoring_data, category_config)
                 category_scores[category_name] = score
                 detailed_scores[category_name] = score_details
 
@@ -110,7 +115,8 @@ class RuleBasedClassifier:
         Calculate score for a specific category.
 
         Args:
-            email_data: Email data dictionary
+            email_data: Email data dictionary, already case-folded unless
+                matching is case-sensitive
             category_config: Category configuration
 
         Returns:
@@ -159,12 +165,12 @@ class RuleBasedClassifier:
 
         # Check high confidence domains
         high_confidence_domains = domain_config.get("high_confidence", [])
-        if any(domain.lower() in sender_domain.lower() for domain in high_confidence_domains):
+        if any(domain.lower() in sender_domain for domain in high_confidence_domains):
             return self.scoring_weights.domain_high_confidence
 
         # Check medium confidence domains
         medium_confidence_domains = domain_config.get("medium_confidence", [])
-        if any(domain.lower() in sender_domain.lower() for domain in medium_confidence_domains):
+        if any(domain.lower() in sender_domain for domain in medium_confidence_domains):
             return self.scoring_weights.domain_medium_confidence
 
         return 0.0
@@ -175,20 +181,19 @@ class RuleBasedClassifier:
             return 0.0
 
         score = 0.0
-        text_lower = text.lower() if not self.config.global_settings.case_sensitive else text
 
         # High priority keywords
         high_keywords = keyword_config.get("subject_high", [])
         for keyword in high_keywords:
             keyword_check = keyword.lower() if not self.config.global_settings.case_sensitive else keyword
-            if keyword_check in text_lower:
+            if keyword_check in text:
                 score += self.scoring_weights.subject_high
 
         # Medium priority keywords
         medium_keywords = keyword_config.get("subject_medium", [])
         for keyword in medium_keywords:
             keyword_check = keyword.lower() if not self.config.global_settings.case_sensitive else keyword
-            if keyword_check in text_lower:
+            if keyword_check in text:
                 score += self.scoring_weights.subject_medium
 
         return score
@@ -199,20 +204,19 @@ class RuleBasedClassifier:
             return 0.0
 
         score = 0.0
-        content_lower = content.lower() if not self.config.global_settings.case_sensitive else content
 
         # High priority keywords
         high_keywords = keyword_config.get("content_high", [])
         for keyword in high_keywords:
             keyword_check = keyword.lower() if not self.config.global_settings.case_sensitive else keyword
-            if keyword_check in content_lower:
+            if keyword_check in content:
                 score += self.scoring_weights.content_high
 
         # Medium priority keywords
         medium_keywords = keyword_config.get("content_medium", [])
         for keyword in medium_keywords:
             keyword_check = keyword.lower() if not self.config.global_settings.case_sensitive else keyword
-            if keyword_check in content_lower:
+            if keyword_check in content:
                 score += self.scoring_weights.content_medium
 
         return score
@@ -229,11 +233,9 @@ class RuleBasedClassifier:
             email_data.get("sender", "")
         ])
 
-        text_check = all_text.lower() if not self.config.global_settings.case_sensitive else all_text
-
         for exclusion in exclusions:
             exclusion_check = exclusion.lower() if not self.config.global_settings.case_sensitive else exclusion
-            if exclusion_check in text_check:
+            if exclusion_check in all_text:
                 return self.scoring_weights.exclusion_penalty
 
         return 0.0
@@ -249,11 +251,9 @@ class RuleBasedClassifier:
             email_data.get("content", "")
         ])
 
-        text_check = all_text.lower() if not self.config.global_settings.case_sensitive else all_text
-
         for keyword in negative_keywords:
             keyword_check = keyword.lower() if not self.config.global_settings.case_sensitive else keyword
-            if keyword_check in text_check:
+            if keyword_check in all_text:
                 penalty += self.scoring_weights.negative_keyword_penalty
 
         return penalty
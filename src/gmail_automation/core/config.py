@@ -8,8 +8,9 @@ including email categories, rules, and system settings.
 import json
 import os
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, FrozenSet
 from dataclasses import dataclass, field
+from functools import cached_property
 import deepmerge
 
 from ..utils.logger import get_logger
@@ -71,6 +72,16 @@ class CategoryConfig:
             negative_keywords=data.get('negative_keywords', [])
         )
 
+    @cached_property
+    def all_domains(self) -> List[str]:
+        """High then medium confidence domains, built once per category."""
+        return self.domains.get('high_confidence', []) + self.domains.get('medium_confidence', [])
+
+    @cached_property
+    def domain_set(self) -> FrozenSet[str]:
+        """All configured domains as a set, for membership and difference checks."""
+        return frozenset(self.all_domains)
+
 
 class Config:
     """
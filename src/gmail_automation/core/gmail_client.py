@@ -5,10 +5,11 @@ Provides high-level interface for Gmail operations including
 authentication, email retrieval, labeling, and batch operations.
 """
 
+import json
 import pickle
 import time
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Iterator
+from typing import Dict, List, Optional, Any, Iterator, Tuple
 import threading
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
@@ -35,6 +36,18 @@ class GmailClient:
     with proper error handling and rate limiting.
     """
 
+    # Maximum calls per batch request (Gmail recommends at most 50), and
+    # retries for rate-limited calls
+    BATCH_LIMIT = 50
+    BATCH_MAX_RETRIES = 5
+
+    # 403 error reasons Gmail uses for per-project and per-user rate limits
+    RATE_LIMIT_REASONS = frozenset({'rateLimitExceeded', 'userRateLimitExceeded'})
+
+    # Partial responses for list calls: only the fields callers read
+    FILTER_LIST_FIELDS = 'filter(id,criteria,action)'
+    LABEL_LIST_FIELDS = 'labels(id,name)'
+
     # Required Gmail API scopes
     SCOPES = [
         'https://www.googleapis.com/auth/gmail.modify',
@@ -67,6 +80,7 @@ class GmailClient:
         else:
             self.token_file = self.config_dir / token_file
         self.service = None
+        self.credentials: Optional[Credentials] = None
         self.user_id = "me"
 
         # Initialize Gmail service
@@ -116,9 +130,15 @@ class GmailClient:
             except Exception as e:
                 logger.warning(f"Failed to save token: {e}")
 
-        # Build Gmail service
+        self.credentials = creds
+
+        # Build Gmail service from the discovery document bundled with
+        # google-api-python-client, so no discovery request is made at startup
         try:
-            self.service = build('gmail', 'v1', credentials=creds)
+            self.service = build(
+                'gmail', 'v1', credentials=creds,
+                static_discovery=True, cache_discovery=False
+            )
             logger.info("Gmail API service initialized successfully")
         except Exception as e:
             raise GmailClientError(f"Failed to build Gmail service: {e}")
@@ -131,7 +151,9 @@ class GmailClient:
             Dictionary mapping label names to label IDs
         """
         try:
-            results = self.service.users().labels().list(userId=self.user_id).execute()
+            results = self.service.users().labels().list(
+                userId=self.user_id, fields=self.LABEL_LIST_FIELDS
+            ).execute()
             labels = results.get('labels', [])
 
             return {label['name']: label['id'] for label in labels}
@@ -610,7 +632,7 @@ class GmailClient:
         """
         try:
             result = self.service.users().settings().filters().list(
-                userId=self.user_id
+                userId=self.user_id, fields=self.FILTER_LIST_FIELDS
             ).execute()
 
             filters = result.get('filter', [])
@@ -621,6 +643,40 @@ class GmailClient:
             logger.error(f"Failed to get filters: {e}")
             raise GmailClientError(f"Failed to retrieve filters: {e}")
 
+    def get_filters_and_labels(self) -> Tuple[List[Dict[str, Any]], Dict[str, str]]:
+        """
+        Get all Gmail filters and labels in a single batched round trip.
+
+        Returns:
+            Tuple of (filter dictionaries, label name to ID mapping)
+        """
+        results: Dict[str, Any] = {}
+        errors: Dict[str, Exception] = {}
+
+        def on_list(request_id, response, exception):
+            if exception is None:
+                results[request_id] = response
+            else:
+                errors[request_id] = exception
+
+        self.execute_batch([
+            ('filters', self.service.users().settings().filters().list(
+                userId=self.user_id, fields=self.FILTER_LIST_FIELDS)),
+            ('labels', self.service.users().labels().list(
+                userId=self.user_id, fields=self.LABEL_LIST_FIELDS)),
+        ], on_list)
+
+        if errors:
+            logger.error(f"Failed to get filters and labels: {errors}")
+            raise GmailClientError(
+                f"Failed to retrieve {' and '.join(sorted(errors))}: {next(iter(errors.values()))}"
+            )
+
+        filters = results['filters'].get('filter', [])
+        labels = results['labels'].get('labels', [])
+        logger.info(f"Retrieved {len(filters)} Gmail filters")
+        return filters, {label['name']: label['id'] for label in labels}
+
     def create_filter(self,
                      criteria: Dict[str, Any],
                      actions: Dict[str, Any]) -> str:
@@ -672,6 +728,115 @@ class GmailClient:
             logger.error(f"Failed to delete filter {filter_id}: {e}")
             raise GmailClientError(f"Failed to delete filter: {e}")
 
+    @staticmethod
+    def _is_rate_limited(exception: Optional[Exception]) -> bool:
+        """Check whether an API error is Gmail asking the caller to slow down."""
+        if not isinstance(exception, HttpError):
+            return False
+        status = exception.resp.status
+        if status == 429:
+            return True
+        if status != 403:
+            return False
+        try:
+            errors = json.loads(exception.content)['error']['errors']
+            reasons = {error.get('reason') for error in errors}
+        except (TypeError, ValueError, KeyError, AttributeError):
+            # Not a JSON error body; match either reason in the raw text
+            return 'ratelimitexceeded' in str(exception.content).lower()
+        return not GmailClient.RATE_LIMIT_REASONS.isdisjoint(reasons)
+
+    @staticmethod
+    def _retry_after(exception: HttpError) -> float:
+        """Seconds the server asked to wait via Retry-After, or 0 if unspecified."""
+        try:
+            return max(0.0, float(exception.resp.get('retry-after', 0)))
+        except (AttributeError, TypeError, ValueError):
+            # Missing headers or an HTTP-date value; fall back to backoff
+            return 0.0
+
+    def execute_batch(self, requests: List[Tuple[str, Any]], callback) -> None:
+        """
+        Execute API requests through Gmail's batch endpoint.
+
+        Requests are sent in chunks of BATCH_LIMIT, one HTTP round trip per
+        chunk. Requests rejected for rate limiting are retried with exponential
+        backoff, or after the server's Retry-After if that is longer, up to
+        BATCH_MAX_RETRIES times before their error is passed to the callback.
+
+        Args:
+            requests: List of (request_id, request) tuples
+            callback: Called as callback(request_id, response, exception) per request
+        """
+        import random
+
+        for attempt in range(self.BATCH_MAX_RETRIES + 1):
+            rate_limited = set()
+            retry_after = 0.0
+
+            def on_response(request_id, response, exception):
+                nonlocal retry_after
+                if attempt < self.BATCH_MAX_RETRIES and self._is_rate_limited(exception):
+                    rate_limited.add(request_id)
+                    retry_after = max(retry_after, self._retry_after(exception))
+                else:
+                    callback(request_id, response, exception)
+
+            for start in range(0, len(requests), self.BATCH_LIMIT):
+                batch = self.service.new_batch_http_request(callback=on_response)
+                for request_id, request in requests[start:start + self.BATCH_LIMIT]:
+                    batch.add(request, request_id=request_id)
+                batch.execute()
+
+            if not rate_limited:
+                return
+
+            requests = [(request_id, request) for request_id, request in requests
+                        if request_id in rate_limited]
+            delay = max(2 ** attempt * 0.1 + random.random() * 0.05, retry_after)
+            logger.debug(f"Rate limit hit for {len(requests)} batched requests, retrying in {delay:.2f}s")
+            time.sleep(delay)
+
+    def batch_create_filters(self,
+                             filters: List[Dict[str, Any]]) -> List[Tuple[Optional[str], Optional[Exception]]]:
+        """
+        Create many Gmail filters through the batch endpoint.
+
+        Args:
+            filters: Filter bodies, each with 'criteria' and 'action'
+
+        Returns:
+            One (filter_id, error) tuple per input filter, in input order;
+            filter_id is None when creation failed. If the batch transport
+            itself fails, filters without a result get that exception.
+        """
+        results: List[Tuple[Optional[str], Optional[Exception]]] = [(None, None)] * len(filters)
+
+        def on_create(request_id, response, exception):
+            index = int(request_id)
+            if exception is None:
+                results[index] = (response.get('id'), None)
+            else:
+                results[index] = (None, exception)
+
+        filters_api = self.service.users().settings().filters()
+        # Indices as request IDs: bodies need not be unique
+        try:
+            self.execute_batch([
+                (str(index), filters_api.create(userId=self.user_id, body=body))
+                for index, body in enumerate(filters)
+            ], on_create)
+        except Exception as e:
+            # Chunks sent before the failure keep their results
+            logger.error(f"Batch filter creation failed: {e}")
+            for index, (filter_id, error) in enumerate(results):
+                if filter_id is None and error is None:
+                    results[index] = (None, e)
+
+        created = sum(1 for filter_id, _ in results if filter_id)
+        logger.info(f"Batch created {created}/{len(filters)} Gmail filters")
+        return results
+
     def create_category_filters(self,
                                category_name: str,
                                category_config,
@@ -687,89 +852,55 @@ class GmailClient:
         Returns:
             List of created filter IDs
         """
-        created_filter_ids = []
-
+        filter_bodies = []
+
+        # Filters for high confidence domains
+        high_confidence_domains = category_config.domains.get('high_confidence', [])
+        for domain in high_confidence_domains:
+            filter_bodies.append({
+                'criteria': {'from': domain},
+                'action': {'addLabelIds': [label_id], 'markAsImportant': True}
+            })
+
+        # Filters for medium confidence domains (less aggressive)
+        for domain in category_config.domains.get('medium_confidence', []):
+            filter_bodies.append({
+                'criteria': {'from': domain},
+                'action': {'addLabelIds': [label_id]}
+            })
+
+        # Filters for high priority subject keywords, grouped to avoid too many filters
+        subject_high_keywords = category_config.keywords.get('subject_high', [])
+        for i in range(0, len(subject_high_keywords), 5):
+            # Create OR query for keywords in this group
+            subject_query = ' OR '.join([f'subject:"{keyword}"' for keyword in subject_high_keywords[i:i+5]])
+            filter_bodies.append({
+                'criteria': {'query': subject_query},
+                'action': {'addLabelIds': [label_id], 'markAsImportant': True}
+            })
+
+        # Filter to exclude promotional content for important categories,
+        # combined with domain criteria for better precision
+        exclusions = category_config.exclusions
+        if exclusions and category_config.priority >= 8 and high_confidence_domains:
+            exclusion_query = ' AND '.join([f'-("{exclusion}")' for exclusion in exclusions])
+            domain_query = ' OR '.join([f'from:{domain}' for domain in high_confidence_domains])
+            filter_bodies.append({
+                'criteria': {'query': f'({domain_query}) AND ({exclusion_query})'},
+                'action': {'addLabelIds': [label_id], 'markAsImportant': True}
+            })
+
+        # Create everything in batches of up to BATCH_LIMIT calls
         try:
-            # Create filters for high confidence domains
-            high_confidence_domains = category_config.domains.get('high_confidence', [])
-            if high_confidence_domains:
-                for domain in high_confidence_domains:
-                    criteria = {
-                        'from': domain
-                    }
-                    actions = {
-                        'addLabelIds': [label_id],
-                        'markAsImportant': True
-                    }
-
-                    filter_id = self.create_filter(criteria, actions)
-                    created_filter_ids.append(filter_id)
-                    logger.info(f"Created filter for domain {domain} -> {category_name}")
-
-            # Create filters for medium confidence domains (less aggressive)
-            medium_confidence_domains = category_config.domains.get('medium_confidence', [])
-            if medium_confidence_domains:
-                for domain in medium_confidence_domains:
-                    criteria = {
-                        'from': domain
-                    }
-                    actions = {
-                        'addLabelIds': [label_id]
-                    }
-
-                    filter_id = self.create_filter(criteria, actions)
-                    created_filter_ids.append(filter_id)
-                    logger.info(f"Created filter for domain {domain} -> {category_name}")
-
-            # Create filters for high priority subject keywords
-            subject_high_keywords = category_config.keywords.get('subject_high', [])
-            if subject_high_keywords:
-                # Group keywords to avoid too many filters
-                keyword_groups = [subject_high_keywords[i:i+5] for i in range(0, len(subject_high_keywords), 5)]
-
-                for group in keyword_groups:
-                    # Create OR query for keywords in this group
-                    subject_query = ' OR '.join([f'subject:"{keyword}"' for keyword in group])
-
-                    criteria = {
-                        'query': subject_query
-                    }
-                    actions = {
-                        'addLabelIds': [label_id],
-                        'markAsImportant': True
-                    }
-
-                    filter_id = self.create_filter(criteria, actions)
-                    created_filter_ids.append(filter_id)
-                    logger.info(f"Created filter for subject keywords group -> {category_name}")
-
-            # Create filter to exclude promotional content for important categories
-            exclusions = category_config.exclusions
-            if exclusions and category_config.priority >= 8:
-                # Create negative filter for exclusions
-                exclusion_query = ' AND '.join([f'-("{exclusion}")' for exclusion in exclusions])
-
-                # Combine with domain criteria for better precision
-                if high_confidence_domains:
-                    domain_query = ' OR '.join([f'from:{domain}' for domain in high_confidence_domains])
-                    combined_query = f'({domain_query}) AND ({exclusion_query})'
-
-                    criteria = {
-                        'query': combined_query
-                    }
-                    actions = {
-                        'addLabelIds': [label_id],
-                        'markAsImportant': True
-                    }
-
-                    filter_id = self.create_filter(criteria, actions)
-                    created_filter_ids.append(filter_id)
-                    logger.info(f"Created exclusion filter for {category_name}")
-
-            logger.info(f"Created {len(created_filter_ids)} filters for category: {category_name}")
-            return created_filter_ids
-
+            results = self.batch_create_filters(filter_bodies)
         except Exception as e:
+            logger.error(f"Failed to create category filters for {category_name}: {e}")
+            raise GmailClientError(f"Failed to create category filters: {e}")
+
+        created_filter_ids = [filter_id for filter_id, _ in results if filter_id]
+        errors = [error for _, error in results if error is not None]
+
+        if errors:
             # Clean up any created filters if there's an error
             for filter_id in created_filter_ids:
                 try:
@@ -777,8 +908,11 @@ class GmailClient:
                 except:
                     pass  # Ignore cleanup errors
 
-            logger.error(f"Failed to create category filters for {category_name}: {e}")
-            raise GmailClientError(f"Failed to create category filters: {e}")
+            logger.error(f"Failed to create category filters for {category_name}: {errors[0]}")
+            raise GmailClientError(f"Failed to create category filters: {errors[0]}")
+
+        logger.info(f"Created {len(created_filter_ids)} filters for category: {category_name}")
+        return created_filter_ids
 
     def list_filter_summary(self) -> Dict[str, Any]:
         """
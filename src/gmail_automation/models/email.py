@@ -5,13 +5,40 @@ Provides structured representation of email data with validation,
 serialization, and utility methods.
 """
 
+import base64
 from dataclasses import dataclass, field
+from functools import cached_property
 from typing import Dict, List, Optional, Any
 from datetime import datetime
-import json
+import re
+import sys
 
+# One address per match: runs of text between commas, where a quoted display
+# name may contain commas. Single pass, so linear in the header length
+_ADDR_TOKEN = re.compile(r'(?:"[^"]*"|[^,"]+|")+')
 
-@dataclass
+# Lowercased header name -> slot in the value list built by from_gmail_headers
+_HEADER_NAME_MAP: Dict[str, int] = {
+    'from': 0,
+    'to': 1,
+    'subject': 2,
+    'cc': 3,
+    'bcc': 4,
+    'reply-to': 5,
+    'message-id': 6,
+}
+
+# One instance of each model is created per message, so drop the per-instance
+# __dict__ where the interpreter supports it (dataclass slots need 3.10+)
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+def _decode_body(data: str) -> str:
+    """Decode a Gmail base64url body part to text."""
+    return base64.urlsafe_b64decode(data).decode('utf-8', errors='ignore')
+
+
+@dataclass(**_SLOTS)
 class EmailMetadata:
     """Email metadata structure."""
     message_id: str
@@ -23,7 +50,7 @@ class EmailMetadata:
     internal_date: Optional[datetime] = None
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class EmailHeaders:
     """Email headers structure."""
     from_address: str = ""
@@ -38,16 +65,20 @@ class EmailHeaders:
     @classmethod
     def from_gmail_headers(cls, headers: List[Dict[str, str]]) -> 'EmailHeaders':
         """Create EmailHeaders from Gmail API headers format."""
-        header_dict = {h.get('name', '').lower(): h.get('value', '') for h in headers}
+        values = [''] * len(_HEADER_NAME_MAP)
+        for h in headers:
+            idx = _HEADER_NAME_MAP.get(h.get('name', '').lower())
+            if idx is not None:
+                values[idx] = h.get('value', '')
 
         return cls(
-            from_address=header_dict.get('from', ''),
-            to_addresses=cls._parse_address_list(header_dict.get('to', '')),
-            subject=header_dict.get('subject', ''),
-            cc_addresses=cls._parse_address_list(header_dict.get('cc', '')),
-            bcc_addresses=cls._parse_address_list(header_dict.get('bcc', '')),
-            reply_to=header_dict.get('reply-to', ''),
-            message_id=header_dict.get('message-id', '')
+            from_address=values[0],
+            to_addresses=cls._parse_address_list(values[1]),
+            subject=values[2],
+            cc_addresses=cls._parse_address_list(values[3]),
+            bcc_addresses=cls._parse_address_list(values[4]),
+            reply_to=values[5],
+            message_id=values[6]
         )
 
     @staticmethod
@@ -55,9 +86,15 @@ class EmailHeaders:
         """Parse comma-separated email addresses."""
         if not address_string:
             return []
-        return [addr.strip() for addr in address_string.split(',') if addr.strip()]
+        # Fast path: single recipient, no splitting needed
+        if ',' not in address_string:
+            address_string = address_string.strip()
+            return [address_string] if address_string else []
+        addresses = [addr.strip() for addr in _ADDR_TOKEN.findall(address_string)]
+        return [addr for addr in addresses if addr]
 
 
+# Not slotted: cached_property needs an instance __dict__
 @dataclass
 class EmailContent:
     """Email content structure."""
@@ -65,13 +102,13 @@ class EmailContent:
     text_html: str = ""
     attachments: List[Dict[str, Any]] = field(default_factory=list)
 
-    @property
+    @cached_property
     def combined_text(self) -> str:
-        """Get combined plain text content for analysis."""
+        """Get combined plain text content for analysis (computed once)."""
         return self.text_plain or self.text_html or ""
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class ClassificationResult:
     """Email classification result."""
     category: str
@@ -81,18 +118,36 @@ class ClassificationResult:
     metadata: Dict[str, Any] = field(default_factory=dict)
     timestamp: datetime = field(default_factory=datetime.now)
 
+    def __post_init__(self) -> None:
+        # Categories and methods repeat across every result; intern them so
+        # downstream dict lookups and comparisons hit the identity fast path
+        self.category = sys.intern(self.category)
+        self.method = sys.intern(self.method)
+
     def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for serialization."""
+        """
+        Convert to dictionary for serialization.
+
+        The timestamp is left as a datetime for serializers that handle it
+        natively (e.g. orjson); use to_json_dict() for the stdlib json module.
+        """
         return {
             'category': self.category,
             'confidence': self.confidence,
             'method': self.method,
             'scores': self.scores,
             'metadata': self.metadata,
-            'timestamp': self.timestamp.isoformat()
+            'timestamp': self.timestamp
         }
 
+    def to_json_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary with an ISO-8601 timestamp for stdlib json."""
+        result = self.to_dict()
+        result['timestamp'] = self.timestamp.isoformat()
+        return result
+
 
+# Not slotted: cached_property needs an instance __dict__
 @dataclass
 class Email:
     """
@@ -106,12 +161,12 @@ class Email:
     content: EmailContent
     classification: Optional[ClassificationResult] = None
 
-    @property
+    @cached_property
     def sender_domain(self) -> str:
         """Extract domain from sender email address."""
         sender = self.headers.from_address
         if '@' in sender:
-            return sender.split('@')[-1].lower()
+            return sys.intern(sender.split('@')[-1].lower())
         return ""
 
     @property
@@ -157,7 +212,7 @@ class Email:
         }
 
         if self.classification:
-            result['classification'] = self.classification.to_dict()
+            result['classification'] = self.classification.to_json_dict()
 
         return result
 
@@ -180,25 +235,31 @@ class Email:
         headers = EmailHeaders.from_gmail_headers(gmail_headers)
 
         # Extract content (simplified - you may want to expand this)
-        content = EmailContent()
+        # Decode into locals and build EmailContent once with final values
+        text_plain = ""
+        text_html = ""
         if 'parts' in payload:
             for part in payload['parts']:
                 if part.get('mimeType') == 'text/plain':
                     body_data = part.get('body', {}).get('data', '')
                     if body_data:
-                        import base64
-                        content.text_plain = base64.urlsafe_b64decode(body_data).decode('utf-8', errors='ignore')
+                        text_plain = _decode_body(body_data)
                 elif part.get('mimeType') == 'text/html':
                     body_data = part.get('body', {}).get('data', '')
                     if body_data:
-                        import base64
-                        content.text_html = base64.urlsafe_b64decode(body_data).decode('utf-8', errors='ignore')
+                        text_html = _decode_body(body_data)
         else:
             # Single part message
             body = payload.get('body', {})
             body_data = body.get('data', '')
             if body_data and payload.get('mimeType') == 'text/plain':
-                import base64
-                content.text_plain = base64.urlsafe_b64decode(body_data).decode('utf-8', errors='ignore')
+                text_plain = _decode_body(body_data)
 
-        return cls(metadata=metadata, headers=headers, content=content)
\ No newline at end of file
+        content = EmailContent(text_plain=text_plain, text_html=text_html)
+        return cls(metadata=metadata, headers=headers, content=content)
+
+    @classmethod
+    def from_gmail_messages(cls, messages: List[Dict[str, Any]]) -> List['Email']:
+        """Create Email instances from a batch of Gmail API messages."""
+        from_message = cls.from_gmail_message
+        return [from_message(message) for message in messages]
@@ -5,11 +5,18 @@ Provides consistent logging across all modules with proper formatting,
 log levels, and optional file output.
 """
 
+import atexit
 import logging
+import queue
 import sys
+from functools import lru_cache
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 from typing import Optional
 
+# Shared formatter for loggers that use the default format
+_DEFAULT_FORMATTER = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
 
 def get_logger(
     name: str,
@@ -29,6 +36,17 @@ def get_logger(
     Returns:
         Configured logger instance
     """
+    return _get_cached_logger(name, level, str(log_file) if log_file else None, format_string)
+
+
+@lru_cache(maxsize=256)
+def _get_cached_logger(
+    name: str,
+    level: int,
+    log_file: Optional[str],
+    format_string: Optional[str]
+) -> logging.Logger:
+    """Build a logger once per argument combination; repeat calls hit the cache."""
     logger = logging.getLogger(name)
 
     # Avoid duplicate handlers
@@ -37,11 +55,10 @@ def get_logger(
 
     logger.setLevel(level)
 
-    # Default format
     if format_string is None:
-        format_string = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-
-    formatter = logging.Formatter(format_string)
+        formatter = _DEFAULT_FORMATTER
+    else:
+        formatter = logging.Formatter(format_string)
 
     # Console handler
     console_handler = logging.StreamHandler(sys.stdout)
@@ -49,13 +66,24 @@ def get_logger(
     console_handler.setFormatter(formatter)
     logger.addHandler(console_handler)
 
-    # Optional file handler
+    # Optional file handler, written from a background thread so bulk
+    # processing only pays for a queue put per record
     if log_file:
-        log_file.parent.mkdir(parents=True, exist_ok=True)
-        file_handler = logging.FileHandler(log_file)
+        log_path = Path(log_file)
+        log_path.parent.mkdir(parents=True, exist_ok=True)
+        file_handler = logging.FileHandler(log_path)
         file_handler.setLevel(level)
         file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+
+        log_queue = queue.SimpleQueue()
+        queue_handler = QueueHandler(log_queue)
+        queue_handler.setLevel(level)
+        logger.addHandler(queue_handler)
+
+        listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+        listener.start()
+        # Flush queued records before the interpreter exits
+        atexit.register(listener.stop)
 
     return logger
 
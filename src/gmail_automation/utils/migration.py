@@ -6,17 +6,72 @@ validate the transition from monolithic to modular architecture.
 """
 
 import json
+import mmap
+import os
 import re
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Tuple
 import ast
-import importlib.util
 
 from ..core.config import Config
 from ..utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Optional fast JSON encoder
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _write_json(data: Any, path: Path) -> None:
+    """Write data as indented UTF-8 JSON, using orjson when installed."""
+    if ORJSON_AVAILABLE:
+        path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+def _parse_bool(value: bytes) -> bool:
+    """Parse a Python boolean literal captured from legacy source."""
+    return value == b'True'
+
+
+# Byte patterns used to scan the memory-mapped legacy source, compiled once at import
+_CATEGORY_RULES_RE = re.compile(rb'CATEGORY_RULES\s*=\s*({.*?})', re.DOTALL)
+
+# AST node types allowed in a CATEGORY_RULES literal (what ast.literal_eval accepts)
+_LITERAL_NODES = (
+    ast.Expression, ast.Constant, ast.Dict, ast.List, ast.Tuple, ast.Set,
+    ast.UnaryOp, ast.UAdd, ast.USub, ast.Load,
+)
+
+# NAME_CATEGORY = "..." constants or categories["..."] = {...} assignments,
+# matched in a single pass over the file
+_INDIVIDUAL_CATEGORY_RE = re.compile(
+    rb'(?P<const_name>\w+_CATEGORY)\s*=\s*["\'](?P<const_value>[^"\']+)["\']'
+    rb'|categories\[["\'"](?P<dict_name>[^"\']+)["\'"]]\s*=\s*(?P<dict_value>{.*?})',
+    re.DOTALL,
+)
+
+# (pattern, output key) pairs for scoring weights
+_WEIGHT_RES = [
+    (re.compile(rb'DOMAIN_WEIGHT\s*=\s*([\d.]+)'), 'domain_weight'),
+    (re.compile(rb'SUBJECT_WEIGHT\s*=\s*([\d.]+)'), 'subject_weight'),
+    (re.compile(rb'CONTENT_WEIGHT\s*=\s*([\d.]+)'), 'content_weight'),
+    (re.compile(rb'CONFIDENCE_THRESHOLD\s*=\s*([\d.]+)'), 'confidence_threshold'),
+]
+
+# (pattern, output key, converter) triples for global settings
+_SETTINGS_RES = [
+    (re.compile(rb'MAX_CATEGORIES\s*=\s*(\d+)'), 'max_categories', int),
+    (re.compile(rb'ENABLE_CONTENT_ANALYSIS\s*=\s*(True|False)'), 'enable_content_analysis', _parse_bool),
+    (re.compile(rb'CASE_SENSITIVE\s*=\s*(True|False)'), 'case_sensitive', _parse_bool),
+]
+
 
 class LegacyMigrator:
     """
@@ -34,24 +89,46 @@ class LegacyMigrator:
             legacy_file_path: Path to legacy gmail_automation.py file
         """
         self.legacy_file_path = legacy_file_path
-        self.legacy_content = ""
+        self.legacy_content = b""
         self.extracted_config = {}
-
-        if not legacy_file_path.exists():
-            raise FileNotFoundError(f"Legacy file not found: {legacy_file_path}")
+        self._mm: Optional[mmap.mmap] = None
+        self._stat: Optional[os.stat_result] = None
 
         self._load_legacy_file()
 
     def _load_legacy_file(self) -> None:
-        """Load and parse legacy file content."""
+        """
+        Memory-map legacy file content.
+
+        Patterns scan the mapped bytes directly; only matched fragments
+        are decoded to text.
+        """
+        # Opening doubles as the existence check; the file is stat'ed once
+        # here and the result reused for the migration report
         try:
-            with open(self.legacy_file_path, 'r', encoding='utf-8') as f:
-                self.legacy_content = f.read()
+            with open(self.legacy_file_path, 'rb') as f:
+                self._stat = os.fstat(f.fileno())
+                # mmap cannot map an empty file
+                if self._stat.st_size:
+                    self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                    self.legacy_content = self._mm
             logger.info(f"Loaded legacy file: {self.legacy_file_path}")
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Legacy file not found: {self.legacy_file_path}") from None
         except Exception as e:
             logger.error(f"Failed to load legacy file: {e}")
             raise
 
+    def close(self) -> None:
+        """Release the memory-mapped legacy file."""
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+            self.legacy_content = b""
+
+    def __del__(self) -> None:
+        self.close()
+
     def extract_email_categories(self) -> Dict[str, Any]:
         """
         Extract email categories configuration from legacy code.
@@ -63,18 +140,30 @@ class LegacyMigrator:
 
         try:
             # Look for CATEGORY_RULES or similar patterns
-            category_pattern = r'CATEGORY_RULES\s*=\s*({.*?})'
-            match = re.search(category_pattern, self.legacy_content, re.DOTALL)
+            match = _CATEGORY_RULES_RE.search(self.legacy_content)
 
             if match:
-                category_text = match.group(1)
-                # Try to safely evaluate the dictionary
+                category_text = match.group(1).decode('utf-8')
+                # Parse and check the expression is a pure literal before
+                # evaluating it, so malformed rules are rejected up front
                 try:
-                    categories = ast.literal_eval(category_text)
-                    logger.info(f"Extracted {len(categories)} categories from legacy code")
-                except (ValueError, SyntaxError) as e:
+                    tree = ast.parse(category_text, mode='eval')
+                except SyntaxError as e:
+                    tree = None
                     logger.warning(f"Could not parse category rules: {e}")
 
+                if tree is not None:
+                    if all(isinstance(node, _LITERAL_NODES) for node in ast.walk(tree)):
+                        # The node check is coarse (e.g. -"x" passes it), so
+                        # literal_eval can still reject the tree
+                        try:
+                            categories = ast.literal_eval(tree)
+                            logger.info(f"Extracted {len(categories)} categories from legacy code")
+                        except (ValueError, TypeError) as e:
+                            logger.warning(f"Could not parse category rules: {e}")
+                    else:
+                        logger.warning("Could not parse category rules: not a literal expression")
+
             # Look for individual category definitions
             if not categories:
                 categories = self._extract_individual_categories()
@@ -88,26 +177,18 @@ class LegacyMigrator:
         """Extract categories from individual variable definitions."""
         categories = {}
 
-        # Common patterns for category definitions
-        patterns = [
-            r'(\w+_CATEGORY)\s*=\s*["\']([^"\']+)["\']',
-            r'categories\[["\'"]([^"\']+)["\'"]]\s*=\s*({.*?})',
-        ]
-
-        for pattern in patterns:
-            matches = re.finditer(pattern, self.legacy_content, re.DOTALL)
-            for match in matches:
-                try:
-                    if len(match.groups()) == 2:
-                        if match.group(2).startswith('{'):
-                            # Dictionary definition
-                            cat_config = ast.literal_eval(match.group(2))
-                            categories[match.group(1)] = cat_config
-                        else:
-                            # Simple string definition
-                            categories[match.group(1)] = {"name": match.group(2)}
-                except Exception as e:
-                    logger.warning(f"Could not parse category definition: {e}")
+        for match in _INDIVIDUAL_CATEGORY_RE.finditer(self.legacy_content):
+            try:
+                if match.group('dict_name') is not None:
+                    # Dictionary definition
+                    name = match.group('dict_name').decode('utf-8')
+                    categories[name] = ast.literal_eval(match.group('dict_value').decode('utf-8'))
+                else:
+                    # Simple string definition
+                    name = match.group('const_name').decode('utf-8')
+                    categories[name] = {"name": match.group('const_value').decode('utf-8')}
+            except Exception as e:
+                logger.warning(f"Could not parse category definition: {e}")
 
         return categories
 
@@ -126,35 +207,16 @@ class LegacyMigrator:
 
         try:
             # Extract scoring weights
-            weight_patterns = [
-                r'DOMAIN_WEIGHT\s*=\s*([\d.]+)',
-                r'SUBJECT_WEIGHT\s*=\s*([\d.]+)',
-                r'CONTENT_WEIGHT\s*=\s*([\d.]+)',
-                r'CONFIDENCE_THRESHOLD\s*=\s*([\d.]+)',
-            ]
-
-            for pattern in weight_patterns:
-                match = re.search(pattern, self.legacy_content)
+            for pattern, weight_name in _WEIGHT_RES:
+                match = pattern.search(self.legacy_content)
                 if match:
-                    weight_name = pattern.split('\\s*')[0].lower()
                     rules["scoring_weights"][weight_name] = float(match.group(1))
 
             # Extract global settings
-            settings_patterns = [
-                r'MAX_CATEGORIES\s*=\s*(\d+)',
-                r'ENABLE_CONTENT_ANALYSIS\s*=\s*(True|False)',
-                r'CASE_SENSITIVE\s*=\s*(True|False)',
-            ]
-
-            for pattern in settings_patterns:
-                match = re.search(pattern, self.legacy_content)
+            for pattern, setting_name, convert in _SETTINGS_RES:
+                match = pattern.search(self.legacy_content)
                 if match:
-                    setting_name = pattern.split('\\s*')[0].lower()
-                    value = match.group(1)
-                    if value in ['True', 'False']:
-                        rules["global_settings"][setting_name] = value == 'True'
-                    else:
-                        rules["global_settings"][setting_name] = int(value)
+                    rules["global_settings"][setting_name] = convert(match.group(1))
 
             logger.info("Extracted classification rules from legacy code")
 
@@ -189,8 +251,7 @@ class LegacyMigrator:
 
             # Save base configuration
             base_config_path = output_dir / "email_categories.json"
-            with open(base_config_path, 'w', encoding='utf-8') as f:
-                json.dump(base_config, f, indent=2, ensure_ascii=False)
+            _write_json(base_config, base_config_path)
 
             # Create empty custom configuration
             custom_config_path = output_dir / "custom_email_rules.json"
@@ -200,8 +261,7 @@ class LegacyMigrator:
                 "scoring_weights": {}
             }
 
-            with open(custom_config_path, 'w', encoding='utf-8') as f:
-                json.dump(custom_config, f, indent=2, ensure_ascii=False)
+            _write_json(custom_config, custom_config_path)
 
             logger.info(f"Generated configuration files in {output_dir}")
             return base_config_path, custom_config_path
@@ -305,7 +365,7 @@ class LegacyMigrator:
             report = {
                 "migration_summary": {
                     "legacy_file": str(self.legacy_file_path),
-                    "legacy_file_size": self.legacy_file_path.stat().st_size,
+                    "legacy_file_size": self._stat.st_size,
                     "categories_found": len(categories),
                     "scoring_weights_found": len(rules.get("scoring_weights", {})),
                     "global_settings_found": len(rules.get("global_settings", {}))
@@ -315,8 +375,7 @@ class LegacyMigrator:
                 "recommendations": self._generate_recommendations(categories, rules)
             }
 
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(report, f, indent=2, ensure_ascii=False)
+            _write_json(report, output_path)
 
             logger.info(f"Migration report saved to {output_path}")
 
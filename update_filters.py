@@ -13,129 +13,375 @@ Usage:
     --update    Update filters from rule-based config (interactive)
 """
 
-import argparse
+import gzip
+import hashlib
+import heapq
 import json
+import os
+import re
 import sys
 import time
+from collections import Counter, defaultdict
+from datetime import datetime
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional, Any
+from typing import TYPE_CHECKING, Callable, Dict, List, Tuple, Optional, Any
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 # Add src to path for imports
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
-from src.gmail_automation.core.gmail_client import GmailClient, GmailClientError
-from src.gmail_automation.core.config import Config, ConfigurationError
+# The Gmail client pulls in the Google API stack; the command functions
+# import it (and the config loader) only once --read or --update is chosen
+if TYPE_CHECKING:
+    from src.gmail_automation.core.gmail_client import GmailClient
+    from src.gmail_automation.core.config import CategoryConfig, Config
+
+# Console and export rules
+SEP = "=" * 80
+DASH = "-" * 80
+
+# Per-account cache of fetched filters and labels, relative to the config
+# directory, so back-to-back --read and --update runs can skip the API round trips
+CACHE_DIR_NAME = ".cache"
+CACHE_TTL = 300
+
+# Accepted answers at the interactive step prompts
+CONFIRM_RESPONSES = frozenset({'confirm', 'yes', 'y'})
+SKIP_RESPONSES = frozenset({'skip', 's', 'n', 'no'})
+
+# Write buffer for filter exports; 1 MiB keeps large exports to a few syscalls
+EXPORT_BUFFER_SIZE = 1 << 20
+
+# Content digest stored next to an export, to skip rewriting an unchanged one
+EXPORT_DIGEST_SUFFIX = '.sha'
+
+# Write buffer and gzip level for filters backups
+BACKUP_BUFFER_SIZE = 64 * 1024
+BACKUP_COMPRESSLEVEL = 3
+
+# Sender address or domain in a Gmail search query such as "from:example.com"
+_FROM_QUERY_RE = re.compile(r'from:(\S+)')
+
+# Display templates for filter criteria and actions, in display order.
+# Flag templates have no placeholder; str.format ignores the extra value.
+_CRITERIA_FIELDS = (
+    ('from', "From: {}"),
+    ('to', "To: {}"),
+    ('subject', "Subject: {}"),
+    ('query', "Query: {}"),
+    ('negatedQuery', "NOT: {}"),
+    ('hasAttachment', "Has attachment"),
+    ('excludeChats', "Exclude chats"),
+    ('size', "Size: {}"),
+    ('sizeComparison', "Size comparison: {}"),
+)
+
+_ACTION_FIELDS = (
+    ('addLabelIds', "Add labels: {}"),
+    ('removeLabelIds', "Remove labels: {}"),
+    ('forward', "Forward to: {}"),
+    ('markAsRead', "Mark as read"),
+    ('markAsImportant', "Mark as important"),
+    ('markAsSpam', "Mark as spam"),
+    ('trash', "Move to trash"),
+)
+
+
+@lru_cache(maxsize=4096)
+def _format_fields_cached(items: Tuple[Tuple[str, Any], ...],
+                          table: Tuple[Tuple[str, str], ...], empty: str) -> Tuple[str, ...]:
+    """Render the set fields of a frozen filter part using a (key, template) table."""
+    fields = dict(items)
+    parts = tuple(
+        template.format(', '.join(value) if isinstance(value, tuple) else value)
+        for key, template in table
+        if (value := fields.get(key))
+    )
+    return parts if parts else (empty,)
+
+
+def _format_fields(fields: Dict, table: Tuple[Tuple[str, str], ...], empty: str) -> List[str]:
+    """Render a filter part, memoized since --read formats every filter for display and export."""
+    items = tuple(sorted(
+        (key, tuple(value) if isinstance(value, list) else value)
+        for key, value in fields.items()
+    ))
+    return list(_format_fields_cached(items, table, empty))
 
 
 def format_filter_criteria(criteria: Dict) -> List[str]:
     """Format filter criteria into readable list."""
-    parts = []
-
-    if criteria.get('from'):
-        parts.append(f"From: {criteria['from']}")
-    if criteria.get('to'):
-        parts.append(f"To: {criteria['to']}")
-    if criteria.get('subject'):
-        parts.append(f"Subject: {criteria['subject']}")
-    if criteria.get('query'):
-        parts.append(f"Query: {criteria['query']}")
-    if criteria.get('negatedQuery'):
-        parts.append(f"NOT: {criteria['negatedQuery']}")
-    if criteria.get('hasAttachment'):
-        parts.append("Has attachment")
-    if criteria.get('excludeChats'):
-        parts.append("Exclude chats")
-    if criteria.get('size'):
-        parts.append(f"Size: {criteria['size']}")
-    if criteria.get('sizeComparison'):
-        parts.append(f"Size comparison: {criteria['sizeComparison']}")
-
-    return parts if parts else ["No criteria"]
+    return _format_fields(criteria, _CRITERIA_FIELDS, "No criteria")
 
 
 def format_filter_actions(actions: Dict) -> List[str]:
     """Format filter actions into readable list."""
-    parts = []
-
-    if actions.get('addLabelIds'):
-        parts.append(f"Add labels: {', '.join(actions['addLabelIds'])}")
-    if actions.get('removeLabelIds'):
-        parts.append(f"Remove labels: {', '.join(actions['removeLabelIds'])}")
-    if actions.get('forward'):
-        parts.append(f"Forward to: {actions['forward']}")
-    if actions.get('markAsRead'):
-        parts.append("Mark as read")
-    if actions.get('markAsImportant'):
-        parts.append("Mark as important")
-    if actions.get('markAsSpam'):
-        parts.append("Mark as spam")
-    if actions.get('trash'):
-        parts.append("Move to trash")
-
-    return parts if parts else ["No actions"]
-
-
-def export_filters_to_file(filters: List[Dict], output_file: Path, labels: Dict[str, str]):
+    return _format_fields(actions, _ACTION_FIELDS, "No actions")
+
+
+def account_cache_dir(gmail_client: "GmailClient", config_dir: Path) -> Path:
+    """
+    Cache directory for the authenticated Gmail account.
+
+    Keyed by a digest of the OAuth refresh token, which identifies the
+    account without an API call and, unlike the access token, survives the
+    periodic token refreshes that rewrite token.json.
+    """
+    refresh_token = getattr(getattr(gmail_client, 'credentials', None), 'refresh_token', None)
+    if not refresh_token:
+        return config_dir / CACHE_DIR_NAME / "default"
+    key = hashlib.blake2b(refresh_token.encode('utf-8'), digest_size=8).hexdigest()
+    return config_dir / CACHE_DIR_NAME / key
+
+
+def load_cached(cache_dir: Path, name: str, ttl: float = CACHE_TTL) -> Optional[Any]:
+    """
+    Load a cached API result if it is younger than ttl seconds.
+
+    Args:
+        cache_dir: Cache directory
+        name: Cache entry name
+        ttl: Maximum age in seconds
+
+    Returns:
+        Cached object, or None if missing, stale or unreadable
+    """
+    path = cache_dir / f"{name}.json"
+    try:
+        if time.time() - path.stat().st_mtime > ttl:
+            return None
+        with open(path, 'rb') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def is_cached(cache_dir: Path, name: str, ttl: float = CACHE_TTL) -> bool:
+    """Check whether a cache entry exists and is younger than ttl seconds."""
+    try:
+        return time.time() - (cache_dir / f"{name}.json").stat().st_mtime <= ttl
+    except OSError:
+        return False
+
+
+def save_cached(cache_dir: Path, name: str, obj: Any) -> Any:
+    """Save an API result to the cache, ignoring write errors, and return it."""
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        (cache_dir / f"{name}.json").write_text(json.dumps(obj, ensure_ascii=False), encoding='utf-8')
+    except OSError:
+        pass
+    return obj
+
+
+def clear_cached(cache_dir: Path, *names: str) -> None:
+    """Drop cache entries after Gmail state has changed."""
+    for name in names:
+        try:
+            (cache_dir / f"{name}.json").unlink()
+        except OSError:
+            pass
+
+
+def cached_call(cache_dir: Optional[Path], name: str, fetch: Callable[[], Any],
+                use_cache: bool = False, ttl: float = CACHE_TTL) -> Any:
+    """
+    Call fetch and cache its result, or reuse a fresh cached result.
+
+    The cache only saves round trips between closely spaced runs; a live
+    fetch always refreshes it and it is never consulted unless use_cache.
+
+    Args:
+        cache_dir: Cache directory, or None to bypass caching
+        name: Cache entry name
+        fetch: Function performing the API call
+        use_cache: Return a cached result younger than ttl if there is one
+        ttl: Maximum cache age in seconds
+
+    Returns:
+        Result of fetch, possibly from the cache
+    """
+    if cache_dir is None:
+        return fetch()
+    if use_cache:
+        cached = load_cached(cache_dir, name, ttl)
+        if cached is not None:
+            return cached
+    return save_cached(cache_dir, name, fetch())
+
+
+def get_label_maps(gmail_client: "GmailClient", cache_dir: Optional[Path] = None,
+                   use_cache: bool = False) -> Tuple[Dict[str, str], Dict[str, str]]:
+    """
+    Fetch Gmail labels once as forward and reverse lookups.
+
+    Args:
+        gmail_client: Gmail client instance
+        cache_dir: Cache directory for the fetched labels, or None
+        use_cache: Reuse recently cached labels instead of fetching
+
+    Returns:
+        Tuple of (label name to ID, label ID to name) dicts
+    """
+    labels = cached_call(cache_dir, 'labels', gmail_client.get_labels, use_cache)
+    return labels, {label_id: name for name, label_id in labels.items()}
+
+
+def fetch_filters_and_labels(gmail_client: "GmailClient", cache_dir: Path,
+                             use_cache: bool = False) -> Tuple[List[Dict], Dict[str, str], Dict[str, str]]:
+    """
+    Fetch Gmail filters and labels, batched into one round trip when both are needed.
+
+    Args:
+        gmail_client: Gmail client instance
+        cache_dir: Cache directory for the fetched results
+        use_cache: Reuse recently cached results instead of fetching
+
+    Returns:
+        Tuple of (filters, label name to ID, label ID to name)
+    """
+    filters = load_cached(cache_dir, 'filters') if use_cache else None
+    labels = load_cached(cache_dir, 'labels') if use_cache else None
+
+    if filters is None and labels is None:
+        filters, labels = gmail_client.get_filters_and_labels()
+        save_cached(cache_dir, 'filters', filters)
+        save_cached(cache_dir, 'labels', labels)
+    elif filters is None:
+        filters = cached_call(cache_dir, 'filters', gmail_client.get_filters)
+    elif labels is None:
+        labels = cached_call(cache_dir, 'labels', gmail_client.get_labels)
+
+    return filters, labels, {label_id: name for name, label_id in labels.items()}
+
+
+def extract_filter_domain(criteria: Dict) -> Optional[str]:
+    """Get the sender domain a filter matches, from 'from' or a 'from:' query."""
+    from_field = criteria.get('from')
+    if from_field:
+        return from_field
+
+    match = _FROM_QUERY_RE.search(criteria.get('query', ''))
+    return match.group(1) if match else None
+
+
+def make_label_substituter(labels: Dict[str, str]) -> Callable[[str], str]:
+    """
+    Build a function that replaces label IDs in text with label names.
+
+    All IDs are matched by one compiled regex, so each text is scanned once
+    instead of once per label. Longer IDs are tried first so an ID that is a
+    prefix of another (Label_1 vs Label_12) cannot corrupt it.
+
+    Args:
+        labels: Dict mapping label IDs to names
+
+    Returns:
+        Function taking a string and returning it with label IDs replaced
+    """
+    if not labels:
+        return lambda text: text
+
+    pattern = re.compile('|'.join(map(re.escape, sorted(labels, key=len, reverse=True))))
+    return lambda text: pattern.sub(lambda match: labels[match.group(0)], text)
+
+
+def export_digest(filters: List[Dict], labels: Dict[str, str]) -> str:
+    """Hash the filters and label names an export is rendered from."""
+    if ORJSON_AVAILABLE:
+        data = orjson.dumps([filters, labels])
+    else:
+        data = json.dumps([filters, labels], ensure_ascii=False).encode('utf-8')
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def export_filters_to_file(filters: List[Dict], output_file: Path, labels: Dict[str, str]) -> bool:
     """
     Export filters to a text file in human-readable format.
 
+    The export is left untouched when it was last written from the same
+    filters and labels.
+
     Args:
         filters: List of filter objects from Gmail API
         output_file: Path to output file
         labels: Dict mapping label IDs to names
+
+    Returns:
+        True if the file was written, False if it was already up to date
     """
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write("# Gmail Filters Export\n")
-        f.write("# This file shows all current Gmail filters\n")
-        f.write("# Format: Each filter shows ID, criteria, and actions\n")
-        f.write("#\n")
-        f.write(f"# Total Filters: {len(filters)}\n")
-        f.write("# Generated: " + time.strftime("%Y-%m-%d %H:%M:%S") + "\n")
-        f.write("\n" + "=" * 80 + "\n\n")
+    digest = export_digest(filters, labels)
+    stamp = output_file.with_suffix(EXPORT_DIGEST_SUFFIX)
+    try:
+        if output_file.exists() and stamp.read_text(encoding='utf-8') == digest:
+            return False
+    except OSError:
+        pass
+
+    substitute_labels = make_label_substituter(labels)
+    separator = "\n" + SEP + "\n\n"
+
+    with open(output_file, 'w', encoding='utf-8', buffering=EXPORT_BUFFER_SIZE) as f:
+        f.write(
+            "# Gmail Filters Export\n"
+            "# This file shows all current Gmail filters\n"
+            "# Format: Each filter shows ID, criteria, and actions\n"
+            "#\n"
+            f"# Total Filters: {len(filters)}\n"
+            f"# Generated: {time.strftime('%Y-%m-%d %H:%M:%S')}\n"
+            f"{separator}"
+        )
 
         for idx, filter_obj in enumerate(filters, 1):
             filter_id = filter_obj.get('id', 'unknown')
             criteria = filter_obj.get('criteria', {})
             actions = filter_obj.get('action', {})
 
-            f.write(f"Filter #{idx}\n")
-            f.write("-" * 80 + "\n")
-            f.write(f"ID: {filter_id}\n\n")
-
-            f.write("Criteria:\n")
+            # Build each filter's block in memory and write it in one call
+            parts = [f"Filter #{idx}\n", DASH, f"\nID: {filter_id}\n\nCriteria:\n"]
             for criterion in format_filter_criteria(criteria):
-                f.write(f"  • {criterion}\n")
-            f.write("\n")
-
-            f.write("Actions:\n")
+                parts.append(f"  • {criterion}\n")
+            parts.append("\nActions:\n")
             for action in format_filter_actions(actions):
                 # Replace label IDs with names
-                action_text = action
-                if 'labels:' in action or 'Add labels:' in action or 'Remove labels:' in action:
-                    for label_id, label_name in labels.items():
-                        action_text = action_text.replace(label_id, label_name)
-                f.write(f"  • {action_text}\n")
-            f.write("\n" + "=" * 80 + "\n\n")
+                if 'labels:' in action:
+                    action = substitute_labels(action)
+                parts.append(f"  • {action}\n")
+            parts.append(separator)
+            f.write(''.join(parts))
 
+    stamp.write_text(digest, encoding='utf-8')
+    return True
 
-def analyze_filter_differences(filters: List[Dict], config: Config, labels: Dict[str, str]) -> Dict:
+
+def analyze_filter_differences(filters: List[Dict], config: "Config", labels: Dict[str, str]) -> Dict:
     """
     Analyze differences between Gmail filters and config rules.
 
     Returns dict with:
-        - filters_by_category: filters grouped by category
+        - filters_by_category: sender domain of each filter (None if it has
+          none), grouped by category
         - config_domains_by_category: domains from config
-        - missing_in_gmail: domains in config but no filter
+        - missing_in_gmail: set of domains in config but no filter
         - contradictions: domains that have different labels in Gmail vs config
         - domain_to_filter_id: mapping of domains to their filter IDs
+        - category_to_domains: set of 'from' domains filtered into each category
     """
     analysis = {
-        'filters_by_category': {},
+        'filters_by_category': defaultdict(list),
         'config_domains_by_category': {},
         'missing_in_gmail': {},
         'contradictions': {},  # domain -> {'gmail_category': X, 'config_category': Y, 'filter_id': Z}
         'domain_to_filter_id': {},  # domain -> filter_id
         'domain_to_category_gmail': {},  # domain -> category name in Gmail
+        'category_to_domains': defaultdict(set),  # category name in Gmail -> domains
         'total_filters': len(filters),
         'total_config_rules': 0
     }
@@ -150,58 +396,120 @@ def analyze_filter_differences(filters: List[Dict], config: Config, labels: Dict
         # Get label from actions
         label_ids = actions.get('addLabelIds', [])
         if label_ids:
+            filter_domain = extract_filter_domain(criteria)
+            from_field = criteria.get('from', '')
             for label_id in label_ids:
                 label_name = labels.get(label_id, 'Unknown')
-                if label_name not in analysis['filters_by_category']:
-                    analysis['filters_by_category'][label_name] = []
-                analysis['filters_by_category'][label_name].append(criteria)
+                analysis['filters_by_category'][label_name].append(filter_domain)
 
                 # Track domain -> category mapping
-                from_field = criteria.get('from', '')
                 if from_field:
+                    analysis['category_to_domains'][label_name].add(from_field)
                     analysis['domain_to_category_gmail'][from_field] = label_name
                     analysis['domain_to_filter_id'][from_field] = filter_id
 
     # Get domains from config and check for contradictions
+    domain_to_category_gmail = analysis['domain_to_category_gmail']
+    domain_to_filter_id = analysis['domain_to_filter_id']
     for category_name, category_config in config.categories.items():
-        domains = category_config.domains
-        all_domains = []
-        all_domains.extend(domains.get('high_confidence', []))
-        all_domains.extend(domains.get('medium_confidence', []))
+        all_domains = category_config.all_domains
 
         analysis['config_domains_by_category'][category_name] = all_domains
+        # Nothing is missing or contradicted for a category without domains
+        if not all_domains:
+            continue
         analysis['total_config_rules'] += len(all_domains)
 
         # Find missing domains (in config but not in Gmail)
-        existing_domains = set()
-        for filter_criteria in analysis['filters_by_category'].get(category_name, []):
-            from_field = filter_criteria.get('from', '')
-            if from_field:
-                existing_domains.add(from_field)
-
-        missing = set(all_domains) - existing_domains
+        # Kept as a set; callers sort only what they display
+        missing = category_config.domain_set.difference(analysis['category_to_domains'].get(category_name, ()))
         if missing:
-            analysis['missing_in_gmail'][category_name] = sorted(list(missing))
+            analysis['missing_in_gmail'][category_name] = missing
 
         # Check for contradictions: domain exists but with different category
         for domain in all_domains:
-            gmail_category = analysis['domain_to_category_gmail'].get(domain)
+            gmail_category = domain_to_category_gmail.get(domain)
             if gmail_category and gmail_category != category_name:
                 # Contradiction found!
                 analysis['contradictions'][domain] = {
                     'gmail_category': gmail_category,
                     'config_category': category_name,
-                    'filter_id': analysis['domain_to_filter_id'].get(domain)
+                    'filter_id': domain_to_filter_id.get(domain)
                 }
 
     return analysis
 
 
+def format_category_breakdown(category_name: str, category_config: "CategoryConfig",
+                              analysis: Dict) -> List[str]:
+    """Build the detailed --read breakdown lines for one category."""
+    out = []
+    gmail_filter_domains = analysis['filters_by_category'].get(category_name, ())
+    all_config_domains = analysis['config_domains_by_category'].get(category_name, ())
+    gmail_count = len(gmail_filter_domains)
+    config_count = len(all_config_domains)
+
+    status = "✓" if gmail_count == config_count else "⚠️"
+    out.append(f"\n  {status} {category_name}:")
+    out.append(f"      Gmail filters: {gmail_count}")
+    out.append(f"      Config rules: {config_count}")
+
+    # Show what current Gmail filters are doing
+    if gmail_filter_domains:
+        out.append(f"\n      📧 Current Gmail Filters (what's active now):")
+        gmail_domains = {domain for domain in gmail_filter_domains if domain}
+
+        for idx, domain in enumerate(heapq.nsmallest(5, gmail_domains), 1):
+            out.append(f"        {idx}. from:{domain} → apply label '{category_name}'")
+        if len(gmail_domains) > 5:
+            out.append(f"        ... and {len(gmail_domains) - 5} more")
+
+    # Config details for this category
+    high_domains = category_config.domains.get('high_confidence', ())
+    medium_domains = category_config.domains.get('medium_confidence', ())
+
+    out.append(f"\n      📋 Config Rules (what should be active):")
+    out.append(f"        • High confidence: {len(high_domains)} domain(s)")
+    out.append(f"        • Medium confidence: {len(medium_domains)} domain(s)")
+
+    # Show sample domains from config with status
+    if all_config_domains:
+        out.append(f"        Sample rules:")
+
+        # Existing Gmail domains for comparison, from the analysis pass
+        existing_domains = analysis['category_to_domains'].get(category_name, ())
+
+        # Show first few with sync status
+        for idx, domain in enumerate(islice(all_config_domains, 5), 1):
+            status_icon, status_text = ("✓", "synced") if domain in existing_domains else ("✗", "MISSING")
+            out.append(f"          {status_icon} from:{domain} → '{category_name}' ({status_text})")
+
+        if len(all_config_domains) > 5:
+            out.append(f"          ... and {len(all_config_domains) - 5} more")
+
+    # Show diff summary
+    if category_name in analysis['missing_in_gmail']:
+        missing = analysis['missing_in_gmail'][category_name]
+        out.append(f"\n      🔴 DIFFERENCE - Missing in Gmail: {len(missing)} rule(s)")
+        out.append(f"         These rules from config are NOT active in Gmail:")
+        for domain in heapq.nsmallest(5, missing):
+            out.append(f"         ✗ from:{domain} → '{category_name}'")
+        if len(missing) > 5:
+            out.append(f"         ... and {len(missing) - 5} more")
+    else:
+        out.append(f"\n      ✅ DIFFERENCE - All config rules are active in Gmail!")
+
+    return out
+
+
 def read_filters_command():
     """Read and display current filters from Gmail."""
-    print("=" * 80)
+    from src.gmail_automation.core.gmail_client import GmailClient, GmailClientError
+    from src.gmail_automation.core.config import Config, ConfigurationError
+
+    print(SEP)
     print("Gmail Filters - Current State")
-    print("=" * 80)
+    print(SEP)
 
     # Initialize Gmail client
     config_dir = Path("data")
@@ -219,10 +527,9 @@ def read_filters_command():
     # Get current filters
     print("📋 Fetching filters from Gmail server...")
     try:
-        filters = gmail_client.get_filters()
-        labels_dict = gmail_client.get_labels()
-        # Reverse mapping for label IDs to names
-        label_id_to_name = {v: k for k, v in labels_dict.items()}
+        # Always live; the results are cached for a following --update run
+        cache_dir = account_cache_dir(gmail_client, config_dir)
+        filters, _, label_id_to_name = fetch_filters_and_labels(gmail_client, cache_dir)
     except Exception as e:
         print(f"❌ Error: {e}")
         return 1
@@ -235,32 +542,35 @@ def read_filters_command():
 
     # Display filters
     print("Current Filters:")
-    print("-" * 80)
+    print(DASH)
 
+    substitute_labels = make_label_substituter(label_id_to_name)
+
+    out = []
     for idx, filter_obj in enumerate(filters, 1):
         filter_id = filter_obj.get('id', 'unknown')
         criteria = filter_obj.get('criteria', {})
         actions = filter_obj.get('action', {})
 
-        print(f"\n{idx:2d}. Filter ID: {filter_id}")
-        print("    Criteria:")
+        out.append(f"\n{idx:2d}. Filter ID: {filter_id}")
+        out.append("    Criteria:")
         for criterion in format_filter_criteria(criteria):
-            print(f"      • {criterion}")
-        print("    Actions:")
+            out.append(f"      • {criterion}")
+        out.append("    Actions:")
         for action in format_filter_actions(actions):
             # Replace label IDs with names
-            action_text = action
-            for label_id, label_name in label_id_to_name.items():
-                action_text = action_text.replace(label_id, label_name)
-            print(f"      • {action_text}")
+            out.append(f"      • {substitute_labels(action)}")
+
+    # Emit the whole listing in one write
+    sys.stdout.write("\n".join(out) + "\n")
 
-    print("\n" + "-" * 80)
+    print("\n" + DASH)
     print(f"\nTotal: {len(filters)} filter(s)")
 
     # Load config and compare
-    print("\n" + "=" * 80)
+    print("\n" + SEP)
     print("📊 Comparing with Configuration Rules")
-    print("=" * 80)
+    print(SEP)
 
     try:
         print("\n📖 Loading configuration from data/...")
@@ -271,94 +581,24 @@ def read_filters_command():
         analysis = analyze_filter_differences(filters, config, label_id_to_name)
 
         print("\n📋 Analysis Results:")
-        print("-" * 80)
+        print(DASH)
         print(f"Total Gmail filters: {analysis['total_filters']}")
         print(f"Total config rules: {analysis['total_config_rules']}")
 
-        # Show breakdown by category
-        print("\n📁 Detailed Breakdown by Category:")
-        for category_name in sorted(config.categories.keys()):
-            gmail_filters_list = analysis['filters_by_category'].get(category_name, [])
-            gmail_count = len(gmail_filters_list)
-            config_count = len(analysis['config_domains_by_category'].get(category_name, []))
-
-            status = "✓" if gmail_count == config_count else "⚠️"
-            print(f"\n  {status} {category_name}:")
-            print(f"      Gmail filters: {gmail_count}")
-            print(f"      Config rules: {config_count}")
-
-            # Show what current Gmail filters are doing
-            if gmail_filters_list:
-                print(f"\n      📧 Current Gmail Filters (what's active now):")
-                # Extract domains from Gmail filters
-                gmail_domains = set()
-                for filter_criteria in gmail_filters_list:
-                    from_field = filter_criteria.get('from', '')
-                    query_field = filter_criteria.get('query', '')
-
-                    if from_field:
-                        gmail_domains.add(from_field)
-                    elif query_field and 'from:' in query_field:
-                        # Extract domain from query
-                        import re
-                        match = re.search(r'from:([^\s]+)', query_field)
-                        if match:
-                            gmail_domains.add(match.group(1))
-
-                gmail_domains_sorted = sorted(gmail_domains)
-                for idx, domain in enumerate(gmail_domains_sorted[:5], 1):
-                    print(f"        {idx}. from:{domain} → apply label '{category_name}'")
-                if len(gmail_domains_sorted) > 5:
-                    print(f"        ... and {len(gmail_domains_sorted) - 5} more")
-
-            # Get config details for this category
-            category_config = config.categories.get(category_name)
-            if category_config:
-                high_domains = category_config.domains.get('high_confidence', [])
-                medium_domains = category_config.domains.get('medium_confidence', [])
-
-                print(f"\n      📋 Config Rules (what should be active):")
-                print(f"        • High confidence: {len(high_domains)} domain(s)")
-                print(f"        • Medium confidence: {len(medium_domains)} domain(s)")
-
-                # Show sample domains from config with status
-                all_config_domains = analysis['config_domains_by_category'].get(category_name, [])
-                if all_config_domains:
-                    print(f"        Sample rules:")
-
-                    # Get existing Gmail domains for comparison
-                    existing_domains = set()
-                    for filter_criteria in gmail_filters_list:
-                        from_field = filter_criteria.get('from', '')
-                        if from_field:
-                            existing_domains.add(from_field)
-
-                    # Show first few with sync status
-                    for idx, domain in enumerate(all_config_domains[:5], 1):
-                        status_icon = "✓" if domain in existing_domains else "✗"
-                        status_text = "synced" if domain in existing_domains else "MISSING"
-                        print(f"          {status_icon} from:{domain} → '{category_name}' ({status_text})")
-
-                    if len(all_config_domains) > 5:
-                        print(f"          ... and {len(all_config_domains) - 5} more")
-
-            # Show diff summary
-            if category_name in analysis['missing_in_gmail']:
-                missing = analysis['missing_in_gmail'][category_name]
-                print(f"\n      🔴 DIFFERENCE - Missing in Gmail: {len(missing)} rule(s)")
-                print(f"         These rules from config are NOT active in Gmail:")
-                for domain in missing[:5]:
-                    print(f"         ✗ from:{domain} → '{category_name}'")
-                if len(missing) > 5:
-                    print(f"         ... and {len(missing) - 5} more")
-            else:
-                print(f"\n      ✅ DIFFERENCE - All config rules are active in Gmail!")
+        # Detailed breakdown is long; only build it when asked for
+        response = input("\n📁 Show detailed breakdown by category? (yes/no): ").strip().lower()
+        if response in CONFIRM_RESPONSES:
+            print("\n📁 Detailed Breakdown by Category:")
+            out = []
+            for category_name, category_config in sorted(config.categories.items()):
+                out.extend(format_category_breakdown(category_name, category_config, analysis))
+            sys.stdout.write("\n".join(out) + "\n")
 
         # Show contradictions
         if analysis['contradictions']:
-            print("\n" + "=" * 80)
+            print("\n" + SEP)
             print("⚠️  CONTRADICTIONS DETECTED")
-            print("=" * 80)
+            print(SEP)
             print(f"\nFound {len(analysis['contradictions'])} domain(s) with conflicting labels:")
             print("These domains have DIFFERENT categories in Gmail vs config:\n")
 
@@ -369,7 +609,7 @@ def read_filters_command():
                 print(f"      Filter ID: {conflict['filter_id']}")
                 print()
 
-            print("=" * 80)
+            print(SEP)
             print("💡 When you run --update, you'll be asked to:")
             print("   • OVERRIDE: Delete Gmail filter and create new one with config category")
             print("   • SKIP: Keep Gmail filter as-is, ignore config for this domain")
@@ -378,9 +618,9 @@ def read_filters_command():
         total_missing = sum(len(v) for v in analysis['missing_in_gmail'].values())
         contradictions_count = len(analysis['contradictions'])
 
-        print("\n" + "=" * 80)
+        print("\n" + SEP)
         print("📊 SUMMARY")
-        print("=" * 80)
+        print(SEP)
 
         if total_missing > 0:
             print(f"⚠️  {total_missing} rule(s) from config are missing in Gmail")
@@ -405,16 +645,20 @@ def read_filters_command():
     response = input("\n💾 Export to file? (yes/no): ").strip().lower()
     if response == 'yes':
         output_file = Path("gmail_filters_export.txt")
-        export_filters_to_file(filters, output_file, label_id_to_name)
-        print(f"✓ Exported to {output_file}")
+        if export_filters_to_file(filters, output_file, label_id_to_name):
+            print(f"✓ Exported to {output_file}")
+        else:
+            print(f"✓ {output_file} is already up to date")
 
     return 0
 
 
-def create_filters_from_config(gmail_client: GmailClient, config: Config,
+def create_filters_from_config(gmail_client: "GmailClient", config: "Config",
                                 existing_filters: List[Dict] = None,
                                 contradictions: Dict = None,
-                                dry_run: bool = False) -> Tuple[int, int, int]:
+                                dry_run: bool = False,
+                                labels: Dict[str, str] = None,
+                                label_id_to_name: Dict[str, str] = None) -> Tuple[int, int, int]:
     """
     Create filters from configuration file.
 
@@ -424,12 +668,15 @@ def create_filters_from_config(gmail_client: GmailClient, config: Config,
         existing_filters: List of existing filters from Gmail
         contradictions: Dict of contradicting domains with resolution strategy
         dry_run: If True, only preview changes
+        labels: Label name to ID mapping already fetched from Gmail; fetched
+            here when not given. Labels created by this call are added to it.
+        label_id_to_name: Reverse of labels, derived from it when not given
 
     Returns:
         Tuple of (success_count, failure_count, already_exists_count)
     """
     print(f"\n{'🔍 DRY RUN MODE' if dry_run else '🚀 CREATING FILTERS'}")
-    print("=" * 80)
+    print(SEP)
 
     success_count = 0
     failure_count = 0
@@ -437,24 +684,26 @@ def create_filters_from_config(gmail_client: GmailClient, config: Config,
     already_exists_count = 0
 
     # Get or create labels
-    labels = gmail_client.get_labels()
-    label_id_to_name = {v: k for k, v in labels.items()}
+    if labels is None:
+        labels, label_id_to_name = get_label_maps(gmail_client)
+    elif label_id_to_name is None:
+        label_id_to_name = {v: k for k, v in labels.items()}
     contradictions = contradictions or {}
 
-    # Build set of existing domain->category mappings to avoid duplicates
-    existing_domain_category = {}
-    if existing_filters:
-        for filter_obj in existing_filters:
-            criteria = filter_obj.get('criteria', {})
-            actions = filter_obj.get('action', {})
-            from_field = criteria.get('from', '')
+    # Build set of existing (domain, category) pairs to avoid duplicates
+    existing_pairs = {
+        (from_field, label_id_to_name.get(label_id, 'Unknown'))
+        for filter_obj in existing_filters or ()
+        if (from_field := filter_obj.get('criteria', {}).get('from'))
+        for label_id in filter_obj.get('action', {}).get('addLabelIds', ())
+    }
 
-            if from_field:
-                label_ids = actions.get('addLabelIds', [])
-                if label_ids:
-                    for label_id in label_ids:
-                        category = label_id_to_name.get(label_id, 'Unknown')
-                        existing_domain_category[from_field] = category
+    # Planned API work, executed below through the batch endpoint
+    filters_to_delete = {}
+    filters_to_create = []
+    # Overridden domains whose old filter is gone, and those left without a replacement
+    deleted_domains = set()
+    lost_domains = []
 
     for category_name, category_config in config.categories.items():
         print(f"\n📁 Category: {category_name}")
@@ -476,10 +725,7 @@ def create_filters_from_config(gmail_client: GmailClient, config: Config,
         label_id = labels.get(category_name)
 
         # Get domains and filter out skipped contradictions and already existing
-        domains = category_config.domains
-        high_domains = domains.get('high_confidence', [])
-        medium_domains = domains.get('medium_confidence', [])
-        all_domains = high_domains + medium_domains
+        all_domains = category_config.all_domains
 
         # Filter out domains based on various conditions
         domains_to_create = []
@@ -488,25 +734,17 @@ def create_filters_from_config(gmail_client: GmailClient, config: Config,
 
         for domain in all_domains:
             # Check if domain already has this exact filter
-            if domain in existing_domain_category:
-                if existing_domain_category[domain] == category_name:
-                    # Already exists with same category - skip
-                    domains_already_exist.append(domain)
-                    already_exists_count += 1
-                    continue
+            if (domain, category_name) in existing_pairs:
+                domains_already_exist.append(domain)
+                already_exists_count += 1
+                continue
 
             # Check contradiction resolution
             if domain in contradictions:
                 if contradictions[domain]['action'] == 'override':
                     domains_to_create.append(domain)
                     # Need to delete old filter first
-                    if not dry_run:
-                        old_filter_id = contradictions[domain]['filter_id']
-                        try:
-                            gmail_client.delete_filter(old_filter_id)
-                            print(f"  🗑️  Deleted old filter for {domain}")
-                        except Exception as e:
-                            print(f"  ⚠️  Could not delete old filter for {domain}: {e}")
+                    filters_to_delete[contradictions[domain]['filter_id']] = domain
                 elif contradictions[domain]['action'] == 'skip':
                     domains_to_skip.append(domain)
                     skipped_count += 1
@@ -522,41 +760,72 @@ def create_filters_from_config(gmail_client: GmailClient, config: Config,
         if dry_run:
             print(f"  Would create {len(domains_to_create)} domain-based filters")
         else:
-            # Create filters for non-skipped domains
-            category_success = 0
-            category_failures = 0
-
-            for domain in domains_to_create:
-                try:
-                    filter_criteria = {'from': domain}
-                    filter_action = {'addLabelIds': [label_id]}
-
-                    gmail_client.service.users().settings().filters().create(
-                        userId='me',
-                        body={
-                            'criteria': filter_criteria,
-                            'action': filter_action
-                        }
-                    ).execute()
-
-                    category_success += 1
-                    time.sleep(0.1)  # Rate limiting
+            filters_to_create.extend(
+                (category_name, domain, label_id) for domain in domains_to_create
+            )
+
+    if not dry_run and filters_to_delete:
+        # Delete overridden filters first so replacements don't collide
+        print(f"\n🗑️  Deleting {len(filters_to_delete)} overridden filter(s)...")
+        filters_api = gmail_client.service.users().settings().filters()
+        delete_reported = set()
+
+        def on_delete(request_id, response, exception):
+            domain = filters_to_delete[request_id]
+            delete_reported.add(request_id)
+            if exception is None:
+                deleted_domains.add(domain)
+                print(f"  🗑️  Deleted old filter for {domain}")
+            else:
+                print(f"  ⚠️  Could not delete old filter for {domain}: {exception}")
 
-                except Exception as e:
-                    # Check if it's a "filter already exists" error
-                    if 'Filter already exists' in str(e):
-                        already_exists_count += 1
-                    else:
-                        category_failures += 1
-                        print(f"  ✗ Failed to create filter for {domain}: {e}")
+        try:
+            gmail_client.execute_batch([
+                (filter_id, filters_api.delete(userId=gmail_client.user_id, id=filter_id))
+                for filter_id in filters_to_delete
+            ], on_delete)
+        except Exception as e:
+            # Deletes without a reported result may or may not have happened
+            unconfirmed = [domain for filter_id, domain in filters_to_delete.items()
+                           if filter_id not in delete_reported]
+            print(f"  ✗ Failed to delete old filters for {', '.join(unconfirmed)}: {e}")
+            failure_count += len(unconfirmed)
+
+    if not dry_run and filters_to_create:
+        print(f"\n📤 Creating {len(filters_to_create)} filter(s)...")
+        try:
+            results = gmail_client.batch_create_filters([
+                {'criteria': {'from': domain}, 'action': {'addLabelIds': [label_id]}}
+                for _, domain, label_id in filters_to_create
+            ])
+        except Exception as e:
+            print(f"  ✗ Failed to create filters: {e}")
+            results = [(None, e)] * len(filters_to_create)
+
+        category_results = {}
+        for (category_name, domain, _), (filter_id, error) in zip(filters_to_create, results):
+            counts = category_results.setdefault(category_name, [0, 0])
+            if error is None:
+                counts[0] += 1
+            elif 'Filter already exists' in str(error):
+                already_exists_count += 1
+            else:
+                counts[1] += 1
+                print(f"  ✗ Failed to create filter for {domain}: {error}")
+                if domain in deleted_domains:
+                    lost_domains.append(domain)
 
+        for category_name, (category_success, category_failures) in category_results.items():
             success_count += category_success
             failure_count += category_failures
 
             if category_success > 0:
-                print(f"  ✓ Created {category_success} filters")
+                print(f"  ✓ {category_name}: created {category_success} filters")
             if category_failures > 0:
-                print(f"  ✗ Failed to create {category_failures} filters")
+                print(f"  ✗ {category_name}: failed to create {category_failures} filters")
+
+    if lost_domains:
+        print(f"\n⚠️  Old filter deleted but no replacement created for: {', '.join(lost_domains)}")
 
     print(f"\n{'Would create' if dry_run else 'Created'} {success_count} filter(s)")
     if already_exists_count > 0:
@@ -569,11 +838,41 @@ def create_filters_from_config(gmail_client: GmailClient, config: Config,
     return success_count, failure_count, already_exists_count
 
 
+def write_backup(backup_file: Path, payload: Dict[str, Any]) -> None:
+    """
+    Write a filters backup as gzip-compressed, indented UTF-8 JSON.
+
+    Uses orjson's C encoder when installed and falls back to the standard
+    library json module otherwise. Filter JSON repeats the same keys for
+    every entry, so compressing it costs less than writing it out in full.
+
+    Args:
+        backup_file: Path to the backup file, conventionally ending in .json.gz
+        payload: Backup contents
+    """
+    with open(backup_file, 'wb', buffering=BACKUP_BUFFER_SIZE) as raw:
+        if ORJSON_AVAILABLE:
+            data = orjson.dumps(payload, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        else:
+            # Serialize first: json.dump would issue a write per token
+            data = json.dumps(payload, indent=2, ensure_ascii=False).encode('utf-8')
+        with gzip.open(raw, 'wb', compresslevel=BACKUP_COMPRESSLEVEL) as f:
+            f.write(data)
+
+        # One durability barrier so a crash during the sync cannot leave a
+        # truncated backup behind
+        raw.flush()
+        os.fsync(raw.fileno())
+
+
 def update_filters_interactive():
     """Interactive step-by-step filter update workflow."""
-    print("=" * 80)
+    from src.gmail_automation.core.gmail_client import GmailClient, GmailClientError
+    from src.gmail_automation.core.config import Config, ConfigurationError
+
+    print(SEP)
     print("Gmail Filter Update Tool - Interactive Mode")
-    print("=" * 80)
+    print(SEP)
 
     # Step 1: Explain workflow
     print("\n📖 This tool will guide you through 6 steps:")
@@ -583,7 +882,7 @@ def update_filters_interactive():
     print("  Step 4: Check for contradictions and resolve")
     print("  Step 5: Preview filters to be created")
     print("  Step 6: Apply changes with backup")
-    print("=" * 80)
+    print(SEP)
 
     response = input("\n👉 Ready to start? (yes/no): ").strip().lower()
     if response != 'yes':
@@ -591,9 +890,9 @@ def update_filters_interactive():
         return 0
 
     # STEP 1: Fetch current filters
-    print("\n" + "=" * 80)
+    print("\n" + SEP)
     print("STEP 1: Fetching Current Filters from Gmail")
-    print("=" * 80)
+    print(SEP)
 
     response = input("\n👉 Press ENTER to fetch filters (or 'skip' to use cached data): ").strip().lower()
 
@@ -610,59 +909,62 @@ def update_filters_interactive():
         print(f"❌ Error: {e}")
         return 1
 
-    if response != 'skip':
+    # Filters and labels are fetched once and reused by every later step;
+    # skipping reuses the results of a recent run when they are fresh
+    use_cache = response in SKIP_RESPONSES
+    cache_dir = account_cache_dir(gmail_client, config_dir)
+    if use_cache and not (is_cached(cache_dir, 'filters') and is_cached(cache_dir, 'labels')):
+        print("⚠️  No recent cached data found, fetching anyway")
+        use_cache = False
+    if not use_cache:
         print("📋 Fetching filters from server...")
-        try:
-            current_filters = gmail_client.get_filters()
-            labels_dict = gmail_client.get_labels()
-            label_id_to_name = {v: k for k, v in labels_dict.items()}
-        except Exception as e:
-            print(f"❌ Error: {e}")
-            return 1
+    try:
+        current_filters, labels_dict, label_id_to_name = fetch_filters_and_labels(
+            gmail_client, cache_dir, use_cache
+        )
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        return 1
 
+    if not use_cache:
         print(f"✓ Found {len(current_filters)} filter(s)")
 
         # Show summary
         print("\nFilter Summary:")
-        print("-" * 80)
-        for idx, filter_obj in enumerate(current_filters[:5], 1):
+        print(DASH)
+        for idx, filter_obj in enumerate(islice(current_filters, 5), 1):
             criteria = filter_obj.get('criteria', {})
             criterion_text = format_filter_criteria(criteria)[0]
             print(f"  {idx}. {criterion_text}")
         if len(current_filters) > 5:
             print(f"  ... and {len(current_filters) - 5} more")
-        print("-" * 80)
+        print(DASH)
     else:
-        print("⏭️  Skipped fetching.")
-        try:
-            current_filters = gmail_client.get_filters()
-            labels_dict = gmail_client.get_labels()
-            label_id_to_name = {v: k for k, v in labels_dict.items()}
-        except Exception as e:
-            print(f"❌ Error: {e}")
-            return 1
+        print(f"⏭️  Skipped fetching, using {len(current_filters)} cached filter(s).")
 
     # STEP 2: Export to file
-    print("\n" + "=" * 80)
+    print("\n" + SEP)
     print("STEP 2: Export Filters to File")
-    print("=" * 80)
+    print(SEP)
 
     response = input("\n👉 Press ENTER to export (or 'skip' to continue): ").strip().lower()
 
     export_file = Path("gmail_filters_export.txt")
 
-    if response != 'skip':
+    if response not in SKIP_RESPONSES:
         print(f"\n💾 Exporting to {export_file}...")
-        export_filters_to_file(current_filters, export_file, label_id_to_name)
-        print(f"✓ Exported {len(current_filters)} filters")
+        if export_filters_to_file(current_filters, export_file, label_id_to_name):
+            print(f"✓ Exported {len(current_filters)} filters")
+        else:
+            print(f"✓ Export unchanged since last run ({len(current_filters)} filters)")
         print(f"📄 Review the file to see all current filters")
     else:
         print("⏭️  Skipped export.")
 
     # STEP 3: Load configuration
-    print("\n" + "=" * 80)
+    print("\n" + SEP)
     print("STEP 3: Load Rule-Based Configuration")
-    print("=" * 80)
+    print(SEP)
 
     response = input("\n👉 Press ENTER to load config (or 'skip' to continue): ").strip().lower()
 
@@ -671,7 +973,7 @@ def update_filters_interactive():
         config = Config(config_dir=config_dir)
         print(f"✓ Loaded configuration")
         print(f"  Categories: {len(config.categories)}")
-        print(f"  Category names: {', '.join(list(config.categories.keys())[:5])}")
+        print(f"  Category names: {', '.join(islice(config.categories, 5))}")
         if len(config.categories) > 5:
             print(f"  ... and {len(config.categories) - 5} more")
     except ConfigurationError as e:
@@ -679,16 +981,15 @@ def update_filters_interactive():
         return 1
 
     # STEP 4: Check for contradictions and resolve
-    print("\n" + "=" * 80)
+    print("\n" + SEP)
     print("STEP 4: Check for Contradictions")
-    print("=" * 80)
+    print(SEP)
 
     # Analyze for contradictions
-    labels_dict = gmail_client.get_labels()
-    label_id_to_name = {v: k for k, v in labels_dict.items()}
     analysis = analyze_filter_differences(current_filters, config, label_id_to_name)
 
     contradiction_resolutions = {}
+    action_counts = Counter()
 
     if analysis['contradictions']:
         print(f"\n⚠️  Found {len(analysis['contradictions'])} contradiction(s)!")
@@ -719,97 +1020,109 @@ def update_filters_interactive():
                 else:
                     print("      Please enter 'override' or 'skip'")
 
-        print("=" * 80)
-        override_count = sum(1 for r in contradiction_resolutions.values() if r['action'] == 'override')
-        skip_count = sum(1 for r in contradiction_resolutions.values() if r['action'] == 'skip')
-        print(f"Resolution summary: {override_count} override(s), {skip_count} skip(s)")
+        print(SEP)
+        action_counts.update(r['action'] for r in contradiction_resolutions.values())
+        print(f"Resolution summary: {action_counts['override']} override(s), {action_counts['skip']} skip(s)")
     else:
         print("\n✅ No contradictions found!")
         print("All existing filters align with config rules.")
 
     # STEP 5: Preview filters
-    print("\n" + "=" * 80)
+    print("\n" + SEP)
     print("STEP 5: Preview Filters to Create")
-    print("=" * 80)
+    print(SEP)
 
     response = input("\n👉 Press ENTER to preview (or 'skip' to final step): ").strip().lower()
 
-    if response != 'skip':
+    if response not in SKIP_RESPONSES:
         print("\n📋 Preview of filters to be created:")
-        print("-" * 80)
+        print(DASH)
 
+        out = []
         total_filters = 0
         skipped_filters = 0
+        n_categories = len(config.categories)
+        skip_domains = frozenset(
+            domain for domain, resolution in contradiction_resolutions.items()
+            if resolution['action'] == 'skip'
+        )
 
-        for category_name, category_config in list(config.categories.items())[:3]:
-            domains = category_config.domains
-            all_domains = domains.get('high_confidence', []) + domains.get('medium_confidence', [])
+        for category_name, category_config in islice(config.categories.items(), 3):
+            all_domains = category_config.all_domains
 
-            # Count skipped domains
-            category_skipped = sum(1 for d in all_domains if d in contradiction_resolutions and contradiction_resolutions[d]['action'] == 'skip')
+            # Count skipped domains; nothing to scan when no contradiction was skipped
+            category_skipped = sum(1 for d in all_domains if d in skip_domains) if skip_domains else 0
 
-            high_count = len(domains.get('high_confidence', []))
-            medium_count = len(domains.get('medium_confidence', []))
-            total = high_count + medium_count - category_skipped
+            domain_count = len(all_domains)
+            high_count = len(category_config.domains.get('high_confidence', ()))
+            medium_count = domain_count - high_count
+            total = domain_count - category_skipped
             total_filters += total
             skipped_filters += category_skipped
 
-            print(f"\n{category_name}:")
-            print(f"  • High confidence domains: {high_count}")
-            print(f"  • Medium confidence domains: {medium_count}")
+            out.append(f"\n{category_name}:")
+            out.append(f"  • High confidence domains: {high_count}")
+            out.append(f"  • Medium confidence domains: {medium_count}")
             if category_skipped > 0:
-                print(f"  • Skipped (contradictions): {category_skipped}")
-                print(f"  • Will create: {total}")
+                out.append(f"  • Skipped (contradictions): {category_skipped}")
+                out.append(f"  • Will create: {total}")
             else:
-                print(f"  • Total filters: {total}")
+                out.append(f"  • Total filters: {total}")
 
-        if len(config.categories) > 3:
-            remaining = len(config.categories) - 3
-            print(f"\n... and {remaining} more categories")
+        if n_categories > 3:
+            out.append(f"\n... and {n_categories - 3} more categories")
 
-        print(f"\n{'=' * 80}")
-        print(f"Estimated total filters to create: {total_filters}")
+        out.append("\n" + SEP)
+        out.append(f"Estimated total filters to create: {total_filters}")
         if skipped_filters > 0:
-            print(f"Filters to skip (user choice): {skipped_filters}")
+            out.append(f"Filters to skip (user choice): {skipped_filters}")
+
+        # Emit the whole preview in one write
+        sys.stdout.write("\n".join(out) + "\n")
     else:
         print("⏭️  Skipped preview.")
 
     # STEP 6: Apply changes
-    print("\n" + "=" * 80)
+    print("\n" + SEP)
     print("STEP 6: Create Filters from Configuration")
-    print("=" * 80)
+    print(SEP)
+    override_count = action_counts['override']
     print("\n⚠️  Warning: This will create new filters based on your configuration.")
-    if contradiction_resolutions:
-        override_count = sum(1 for r in contradiction_resolutions.values() if r['action'] == 'override')
-        if override_count > 0:
-            print(f"⚠️  Will delete {override_count} existing filter(s) and replace with config rules.")
+    if override_count > 0:
+        print(f"⚠️  Will delete {override_count} existing filter(s) and replace with config rules.")
     print("💡 Tip: A backup will be created before any changes.")
 
     response = input("\n👉 Type 'confirm' to create filters, or 'skip' to exit: ").strip().lower()
 
-    if response == 'confirm' or response == 'yes':
+    if response in CONFIRM_RESPONSES:
         # Backup current filters
         print("\n💾 Creating backup of current filters...")
-        timestamp = time.strftime("%Y%m%d_%H%M%S")
-        backup_file = Path(f"filters_backup_{timestamp}.json")
-
-        with open(backup_file, 'w', encoding='utf-8') as f:
-            json.dump({
-                'timestamp': time.strftime("%Y-%m-%d %H:%M:%S"),
-                'filters': current_filters,
-                'contradiction_resolutions': contradiction_resolutions
-            }, f, indent=2, ensure_ascii=False)
+        now = datetime.now()
+        timestamp = now.strftime("%Y%m%d_%H%M%S")
+        backup_file = Path(f"filters_backup_{timestamp}.json.gz")
+
+        write_backup(backup_file, {
+            'timestamp': now.strftime("%Y-%m-%d %H:%M:%S"),
+            'filters': current_filters,
+            'contradiction_resolutions': contradiction_resolutions
+        })
         print(f"✓ Backup saved to: {backup_file}")
 
-        # Create filters with contradiction resolutions
-        success, failure, already_exists = create_filters_from_config(
-            gmail_client, config,
-            existing_filters=current_filters,
-            contradictions=contradiction_resolutions,
-            dry_run=False
-        )
-
-        print(f"\n{'=' * 80}")
+        # Create filters with contradiction resolutions; Gmail's state may have
+        # changed even if this fails part way, so the cache is always dropped
+        try:
+            success, failure, already_exists = create_filters_from_config(
+                gmail_client, config,
+                existing_filters=current_filters,
+                labels=labels_dict,
+                label_id_to_name=label_id_to_name,
+                contradictions=contradiction_resolutions,
+                dry_run=False
+            )
+        finally:
+            clear_cached(cache_dir, 'filters', 'labels')
+
+        print("\n" + SEP)
         if failure == 0:
             print("✅ Filter sync completed successfully!")
         else:
@@ -820,8 +1133,7 @@ def update_filters_interactive():
         if already_exists > 0:
             print(f"  ⏭️  Already exist: {already_exists} filter(s)")
         if contradiction_resolutions:
-            override_count = sum(1 for r in contradiction_resolutions.values() if r['action'] == 'override')
-            skip_count = sum(1 for r in contradiction_resolutions.values() if r['action'] == 'skip')
+            skip_count = action_counts['skip']
             if override_count > 0:
                 print(f"  🔄 Overridden: {override_count} conflicting filter(s)")
             if skip_count > 0:
@@ -838,9 +1150,9 @@ def update_filters_interactive():
 
 def show_help():
     """Display help information."""
-    print("=" * 80)
+    print(SEP)
     print("Gmail Filter Update Tool - Help")
-    print("=" * 80)
+    print(SEP)
     print("\n📖 Usage:")
     print("  python update_filters.py [--help] [--read] [--update]")
     print("\n📋 Commands:")
@@ -859,11 +1171,13 @@ def show_help():
     print("  • Preview filters before creating")
     print("  • Automatic backup of existing filters")
     print("  • Does not modify or delete existing filters")
-    print("=" * 80)
+    print(SEP)
 
 
-def main():
-    """Main entry point with argument parsing."""
+def build_parser():
+    """Build the command-line parser, importing argparse only when needed."""
+    import argparse
+
     parser = argparse.ArgumentParser(
         description="Gmail Filter Update Tool - Manage Gmail filters from config",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -881,35 +1195,55 @@ Features:
         """
     )
 
-    parser.add_argument(
+    # The commands are alternatives; asking for both is a usage error
+    commands = parser.add_mutually_exclusive_group()
+
+    commands.add_argument(
         '--read',
         action='store_true',
         help='Read and display current filters from Gmail server'
     )
 
-    parser.add_argument(
+    commands.add_argument(
         '--update',
         action='store_true',
         help='Create filters from config (interactive workflow)'
     )
 
-    args = parser.parse_args()
+    return parser
 
-    # If no arguments provided, show help
-    if len(sys.argv) == 1:
-        parser.print_help()
-        print("\n💡 Tip: Use --read to view current filters or --update to create from config")
-        return 0
 
-    # Execute command based on arguments
-    try:
+def main():
+    """Main entry point with argument parsing."""
+    argv = sys.argv[1:]
+
+    # The two plain invocations dispatch directly; everything else (help,
+    # no arguments, abbreviations, errors) goes through argparse
+    if argv == ['--read']:
+        command = read_filters_command
+    elif argv == ['--update']:
+        command = update_filters_interactive
+    else:
+        parser = build_parser()
+        args = parser.parse_args()
+
+        # If no arguments provided, show help
+        if not argv:
+            parser.print_help()
+            print("\n💡 Tip: Use --read to view current filters or --update to create from config")
+            return 0
+
         if args.read:
-            return read_filters_command()
+            command = read_filters_command
         elif args.update:
-            return update_filters_interactive()
+            command = update_filters_interactive
         else:
             parser.print_help()
             return 0
+
+    # Execute command based on arguments
+    try:
+        return command()
     except KeyboardInterrupt:
         print("\n\n⚠️  Interrupted by user. Exiting safely...")
         return 130
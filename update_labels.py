@@ -14,12 +14,21 @@ Usage:
 """
 
 import argparse
+import difflib
 import json
+import re
 import sys
 import time
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Add src to path for imports
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
@@ -42,9 +51,35 @@ COLOR_PALETTE = {
     "gray": {"textColor": "#ffffff", "backgroundColor": "#666666"},
 }
 
+# Color names accepted in the update file
+_VALID_COLORS = frozenset(COLOR_PALETTE)
+
 # Color rotation order for automatic assignment
 COLOR_ROTATION = ["blue", "green", "orange", "purple", "red", "teal", "pink", "yellow", "brown", "gray"]
 
+# Friendly names for the rest of Gmail's label palette
+GMAIL_COLOR_NAMES = {
+    "#000000": "black", "#434343": "dark gray", "#666666": "gray",
+    "#999999": "light gray", "#cccccc": "very light gray", "#efefef": "off white",
+    "#f3f3f3": "near white", "#ffffff": "white",
+    "#fb4c2f": "coral red", "#ffad47": "orange", "#fad165": "yellow",
+    "#16a766": "green", "#43d692": "teal", "#4a86e8": "blue",
+    "#a479e2": "purple", "#f691b3": "pink",
+    "#cc3a21": "red", "#ac2b16": "brown",
+}
+
+# Lowercase background hex -> color name; COLOR_PALETTE names take precedence
+_COLOR_NAMES = {
+    **GMAIL_COLOR_NAMES,
+    **{config['backgroundColor'].lower(): name for name, config in reversed(COLOR_PALETTE.items())},
+}
+
+# Update file lines starting with these are comments or separators
+_SKIP_LINE_PREFIXES = ('#', '=')
+
+# "old | new | color" update line; matches only with exactly three fields
+_UPDATE_LINE_RE = re.compile(r'([^|]*?)\s*\|\s*([^|]*?)\s*\|\s*([^|]*)')
+
 # Suggested category enhancements
 CATEGORY_SUGGESTIONS = {
     "Finance & Bills": {"emoji": "💰", "color": "green"},
@@ -59,16 +94,28 @@ CATEGORY_SUGGESTIONS = {
     "News & Updates": {"emoji": "📰", "color": "brown"},
 }
 
+# Lowercased category -> (category, suggestion) for case-insensitive matching
+_CATEGORY_SUGGESTIONS_LOWER = {
+    category.lower(): (category, suggestion)
+    for category, suggestion in CATEGORY_SUGGESTIONS.items()
+}
+
+# Minimum similarity (0-1) for a misspelled label to match a category
+SUGGESTION_SIMILARITY_CUTOFF = 0.8
+
 
 def get_current_labels(gmail_client: GmailClient) -> Dict[str, Dict]:
     """
     Get current category labels with details.
 
-    Optimization: Uses batch request to fetch all label details in one API call
-    instead of individual requests per label.
+    Optimization: A single labels.list call already returns each label's color,
+    so no per-label get requests are made.
     """
     try:
-        all_labels = gmail_client.service.users().labels().list(userId='me').execute()
+        # Partial response: only the fields used below and in backups
+        all_labels = gmail_client.service.users().labels().list(
+            userId='me', fields='labels(id,name,type,color)'
+        ).execute()
         labels_with_details = {}
 
         for label in all_labels.get('labels', []):
@@ -84,18 +131,40 @@ def get_current_labels(gmail_client: GmailClient) -> Dict[str, Dict]:
         raise GmailClientError(f"Failed to fetch labels: {e}")
 
 
+@lru_cache(maxsize=1024)
 def suggest_enhancements(current_name: str) -> Dict[str, str]:
-    """Suggest enhancements for a label name."""
-    # Try exact match first
-    for category, suggestion in CATEGORY_SUGGESTIONS.items():
-        if current_name.lower() in category.lower() or category.lower() in current_name.lower():
-            return {
-                "suggested_name": f"{suggestion['emoji']} {category}",
-                "suggested_color": suggestion['color']
-            }
+    """
+    Suggest enhancements for a label name.
+
+    Optimization: Results are memoized, since each label is looked up both for
+    the on-screen suggestions and again for the template. Callers must not
+    modify the returned dict.
+    """
+    # Try substring match first
+    name_lower = current_name.lower()
+    match = next(
+        (value for category_lower, value in _CATEGORY_SUGGESTIONS_LOWER.items()
+         if name_lower in category_lower or category_lower in name_lower),
+        None
+    )
+
+    # Then tolerate typos such as "Finnance & Bills"
+    if match is None:
+        close = difflib.get_close_matches(
+            name_lower, _CATEGORY_SUGGESTIONS_LOWER, n=1, cutoff=SUGGESTION_SIMILARITY_CUTOFF
+        )
+        if close:
+            match = _CATEGORY_SUGGESTIONS_LOWER[close[0]]
+
+    if match is not None:
+        category, suggestion = match
+        return {
+            "suggested_name": f"{suggestion['emoji']} {category}",
+            "suggested_color": suggestion['color']
+        }
 
     # Default suggestion - just add emoji if not present
-    has_emoji = any(char for char in current_name if ord(char) > 127)
+    has_emoji = not current_name.isascii()
     if not has_emoji:
         return {
             "suggested_name": f"📁 {current_name}",
@@ -108,29 +177,42 @@ def suggest_enhancements(current_name: str) -> Dict[str, str]:
     }
 
 
-def create_template_file(current_labels: Dict[str, Dict], output_file: Path):
-    """Create a template file with current labels and suggestions."""
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write("# Gmail Label Update Configuration\n")
-        f.write("# Format: old_name | new_name | color\n")
-        f.write("# Available colors: red, orange, yellow, green, teal, blue, purple, pink, brown, gray\n")
-        f.write("# Lines starting with # are ignored\n")
-        f.write("# Leave 'new_name' empty (or same as old) to keep current name\n")
-        f.write("# Leave 'color' empty to keep current color\n\n")
-
-        f.write("=" * 80 + "\n\n")
-
-        sorted_labels = sorted(current_labels.items())
-        for idx, (label_name, details) in enumerate(sorted_labels):
-            suggestion = suggest_enhancements(label_name)
-            current_color = get_color_name(details.get('color', {}))
+def create_template_file(current_labels: Dict[str, Dict], output_file: Path,
+                         sorted_names: Optional[List[str]] = None):
+    """
+    Create a template file with current labels and suggestions.
 
-            # Assign different color from rotation for each label
-            suggested_color = COLOR_ROTATION[idx % len(COLOR_ROTATION)]
+    Optimization: Callers that already sorted the label names pass them as
+    sorted_names so the labels are not sorted again. The file is assembled
+    in memory and written in one call.
+    """
+    if sorted_names is None:
+        sorted_names = sorted(current_labels)
+
+    chunks = [
+        "# Gmail Label Update Configuration\n"
+        "# Format: old_name | new_name | color\n"
+        "# Available colors: red, orange, yellow, green, teal, blue, purple, pink, brown, gray\n"
+        "# Lines starting with # are ignored\n"
+        "# Leave 'new_name' empty (or same as old) to keep current name\n"
+        "# Leave 'color' empty to keep current color\n\n"
+        + "=" * 80 + "\n\n"
+    ]
+
+    for idx, label_name in enumerate(sorted_names):
+        suggested_name = suggest_enhancements(label_name)['suggested_name']
+
+        # Assign different color from rotation for each label
+        suggested_color = COLOR_ROTATION[idx % len(COLOR_ROTATION)]
+
+        chunks.append(
+            f"# Current: {label_name}\n"
+            f"# Suggested: {suggested_name} (color: {suggested_color})\n"
+            f"{label_name} | {suggested_name} | {suggested_color}\n\n"
+        )
 
-            f.write(f"# Current: {label_name}\n")
-            f.write(f"# Suggested: {suggestion['suggested_name']} (color: {suggested_color})\n")
-            f.write(f"{label_name} | {suggestion['suggested_name']} | {suggested_color}\n\n")
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write("".join(chunks))
 
 
 def get_color_name(color_config: Dict) -> str:
@@ -142,28 +224,7 @@ def get_color_name(color_config: Dict) -> str:
     if not color_config:
         return "default"
 
-    bg = color_config.get('backgroundColor', '').lower()
-
-    # Exact match first
-    for name, config in COLOR_PALETTE.items():
-        if config['backgroundColor'].lower() == bg:
-            return name
-
-    # Check if it's a Gmail palette color
-    gmail_colors = {
-        "#000000": "black", "#434343": "dark gray", "#666666": "gray",
-        "#999999": "light gray", "#cccccc": "very light gray", "#efefef": "off white",
-        "#f3f3f3": "near white", "#ffffff": "white",
-        "#fb4c2f": "coral red", "#ffad47": "orange", "#fad165": "yellow",
-        "#16a766": "green", "#43d692": "teal", "#4a86e8": "blue",
-        "#a479e2": "purple", "#f691b3": "pink",
-        "#cc3a21": "red", "#ac2b16": "brown",
-    }
-
-    if bg in gmail_colors:
-        return gmail_colors[bg]
-
-    return "custom"
+    return _COLOR_NAMES.get(color_config.get('backgroundColor', '').lower(), "custom")
 
 
 def parse_update_file(file_path: Path) -> Tuple[List[Tuple[str, str, str]], List[str]]:
@@ -176,35 +237,37 @@ def parse_update_file(file_path: Path) -> Tuple[List[Tuple[str, str, str]], List
     updates = []
     warnings = []
 
-    if not file_path.exists():
+    # The file is small; read it in one go rather than line by line
+    try:
+        data = file_path.read_text(encoding='utf-8')
+    except FileNotFoundError:
         warnings.append(f"File not found: {file_path}")
         return updates, warnings
 
-    with open(file_path, 'r', encoding='utf-8') as f:
-        for line_num, line in enumerate(f, 1):
-            line = line.strip()
+    for line_num, line in enumerate(data.splitlines(), 1):
+        line = line.strip()
 
-            # Skip comments and empty lines
-            if not line or line.startswith('#') or line.startswith('='):
-                continue
+        # Skip comments, separators and empty lines
+        if not line or line.startswith(_SKIP_LINE_PREFIXES):
+            continue
 
-            parts = [p.strip() for p in line.split('|')]
-            if len(parts) != 3:
-                warnings.append(f"Line {line_num}: Invalid format, expected 3 parts separated by '|'")
-                continue
+        match = _UPDATE_LINE_RE.fullmatch(line)
+        if not match:
+            warnings.append(f"Line {line_num}: Invalid format, expected 3 parts separated by '|'")
+            continue
 
-            old_name, new_name, color = parts
+        old_name, new_name, color = match.groups()
 
-            # If new_name is empty or same as old, keep old name
-            if not new_name or new_name == old_name:
-                new_name = old_name
+        # If new_name is empty or same as old, keep old name
+        if not new_name or new_name == old_name:
+            new_name = old_name
 
-            # Validate color
-            if color and color not in COLOR_PALETTE:
-                warnings.append(f"Line {line_num}: Invalid color '{color}', will be ignored")
-                color = ""
+        # Validate color
+        if color and color not in _VALID_COLORS:
+            warnings.append(f"Line {line_num}: Invalid color '{color}', will be ignored")
+            color = ""
 
-            updates.append((old_name, new_name, color))
+        updates.append((old_name, new_name, color))
 
     return updates, warnings
 
@@ -219,19 +282,20 @@ def backup_labels(current_labels: Dict[str, Dict], backup_file: Optional[Path] =
         timestamp = time.strftime("%Y%m%d_%H%M%S")
         backup_file = Path(f"label_backup_{timestamp}.json")
 
+    # get_current_labels already keeps just the id and color of each label,
+    # which is the backup format; it is serialized as-is
     backup_data = {
         'timestamp': time.strftime("%Y-%m-%d %H:%M:%S"),
-        'labels': {}
+        'labels': current_labels
     }
 
-    for name, details in current_labels.items():
-        backup_data['labels'][name] = {
-            'id': details['id'],
-            'color': details.get('color', {})
-        }
-
-    with open(backup_file, 'w', encoding='utf-8') as f:
-        json.dump(backup_data, f, indent=2, ensure_ascii=False)
+    # Serialize first and write once; orjson's C encoder when installed
+    if ORJSON_AVAILABLE:
+        data = orjson.dumps(backup_data, option=orjson.OPT_INDENT_2)
+    else:
+        data = json.dumps(backup_data, indent=2, ensure_ascii=False).encode('utf-8')
+    with open(backup_file, 'wb') as f:
+        f.write(data)
 
     return backup_file
 
@@ -241,7 +305,9 @@ def apply_updates(gmail_client: GmailClient, updates: List[Tuple[str, str, str]]
     """
     Apply label updates.
 
-    Optimization: Accepts current_labels to avoid refetching from server.
+    Optimization: Accepts current_labels to avoid refetching from server, and
+    sends all updates through Gmail's batch endpoint instead of one request
+    per label.
     Returns: Tuple of (success_count, failure_count)
     """
     print(f"\n{'🔍 DRY RUN MODE' if dry_run else '🚀 APPLYING UPDATES'}")
@@ -250,11 +316,20 @@ def apply_updates(gmail_client: GmailClient, updates: List[Tuple[str, str, str]]
     success_count = 0
     failure_count = 0
 
+    # Planned (old_name, label_id, update_body), executed below in batches
+    pending = []
+
     for old_name, new_name, color in updates:
         if old_name not in current_labels:
             print(f"⚠️  Label not found: {old_name}, skipping...")
             continue
 
+        # Nothing to change: same name, and no color or the one it already has.
+        # Renames keep the color, since labels().update replaces the whole label
+        if new_name == old_name and (
+                not color or COLOR_PALETTE[color] == current_labels[old_name].get('color')):
+            continue
+
         label_id = current_labels[old_name]['id']
         changes = []
 
@@ -265,32 +340,46 @@ def apply_updates(gmail_client: GmailClient, updates: List[Tuple[str, str, str]]
             update_body['name'] = new_name
             changes.append(f"name: {old_name} → {new_name}")
 
-        if color and color in COLOR_PALETTE:
+        if color:
             update_body['color'] = COLOR_PALETTE[color]
             changes.append(f"color: {color}")
 
-        if not changes:
-            continue
-
         print(f"\n{'Would update' if dry_run else 'Updating'}: {old_name}")
         for change in changes:
             print(f"  - {change}")
 
-        if not dry_run:
-            try:
-                gmail_client.service.users().labels().update(
-                    userId='me',
-                    id=label_id,
-                    body=update_body
-                ).execute()
-                print(f"  ✓ Success")
+        pending.append((old_name, label_id, update_body))
+
+    if not dry_run and pending:
+        print(f"\n📤 Sending {len(pending)} label update(s)...")
+        labels_api = gmail_client.service.users().labels()
+        reported = set()
+
+        def on_update(request_id, response, exception):
+            nonlocal success_count, failure_count
+            reported.add(request_id)
+            old_name = pending[int(request_id)][0]
+            if exception is None:
+                print(f"  ✓ {old_name}")
                 success_count += 1
-                time.sleep(0.1)  # Rate limiting to avoid API quota issues
-            except Exception as e:
-                print(f"  ✗ Failed: {e}")
+            else:
+                print(f"  ✗ {old_name}: {exception}")
                 failure_count += 1
 
-    total = success_count if not dry_run else len([u for u in updates if u[0] in current_labels])
+        # Indices as request IDs: the update file may list a label twice
+        try:
+            gmail_client.execute_batch([
+                (str(index), labels_api.update(userId='me', id=label_id, body=update_body))
+                for index, (_, label_id, update_body) in enumerate(pending)
+            ], on_update)
+        except Exception as e:
+            # Updates without a reported result may or may not have happened
+            unconfirmed = [old_name for index, (old_name, _, _) in enumerate(pending)
+                           if str(index) not in reported]
+            print(f"  ✗ Failed to update {', '.join(unconfirmed)}: {e}")
+            failure_count += len(unconfirmed)
+
+    total = success_count if not dry_run else len(pending)
     print(f"\n{'Would update' if dry_run else 'Updated'} {total} label(s)")
     if failure_count > 0:
         print(f"Failed: {failure_count} label(s)")
@@ -402,26 +491,36 @@ def update_labels_interactive():
 
     response = input("\n👉 Press ENTER to fetch labels (or 'skip' to use existing data): ").strip().lower()
 
-    # Initialize Gmail client (needed for both cases)
+    # Connecting and fetching are deferred until the labels are first needed,
+    # so skipped steps and local-only steps do not wait on the network
     config_dir = Path("data")
-    try:
-        print("\n🔌 Connecting to Gmail...")
-        gmail_client = GmailClient(
-            credentials_file="credentials.json",
-            token_file="token.json",
-            config_dir=config_dir
-        )
-    except GmailClientError as e:
-        print(f"❌ Error: {e}")
-        return 1
-
-    if response != 'skip':
-        # Get current labels from server
-        print("📋 Fetching labels from server...")
+    gmail_client = None
+    current_labels = None
+    sorted_names = None
+
+    def load_labels() -> bool:
+        """Connect and fetch labels on first use. Returns False on error."""
+        nonlocal gmail_client, current_labels, sorted_names
+        if current_labels is not None:
+            return True
         try:
+            print("\n🔌 Connecting to Gmail...")
+            gmail_client = GmailClient(
+                credentials_file="credentials.json",
+                token_file="token.json",
+                config_dir=config_dir
+            )
+            print("📋 Fetching labels from server...")
             current_labels = get_current_labels(gmail_client)
         except GmailClientError as e:
             print(f"❌ Error: {e}")
+            return False
+        # Sorted once; reused for suggestions and the template
+        sorted_names = sorted(current_labels)
+        return True
+
+    if response != 'skip':
+        if not load_labels():
             return 1
 
         if not current_labels:
@@ -433,18 +532,12 @@ def update_labels_interactive():
         # Display current labels
         print("Current Labels:")
         print("-" * 80)
-        for idx, (label_name, details) in enumerate(sorted(current_labels.items()), 1):
-            color = get_color_name(details.get('color', {}))
+        for idx, label_name in enumerate(sorted_names, 1):
+            color = get_color_name(current_labels[label_name].get('color', {}))
             print(f"{idx:2d}. {label_name} (color: {color})")
         print("-" * 80)
     else:
-        print("⏭️  Skipped fetching. Will use existing label data for updates.")
-        # Still need to get labels for later steps
-        try:
-            current_labels = get_current_labels(gmail_client)
-        except GmailClientError as e:
-            print(f"❌ Error: {e}")
-            return 1
+        print("⏭️  Skipped fetching. Labels will be fetched when they are needed.")
 
     # STEP 2: Generate template
     print("\n" + "=" * 80)
@@ -456,11 +549,13 @@ def update_labels_interactive():
     template_file = Path("label_updates.txt")
 
     if response != 'skip':
+        if not load_labels():
+            return 1
+
         # Show suggestions
         print("\n💡 Color Suggestions (each label gets a different color):")
         print("-" * 80)
-        sorted_labels = sorted(current_labels.keys())
-        for idx, label_name in enumerate(sorted_labels):
+        for idx, label_name in enumerate(sorted_names):
             suggestion = suggest_enhancements(label_name)
             auto_color = COLOR_ROTATION[idx % len(COLOR_ROTATION)]
             if suggestion['suggested_name'] != label_name:
@@ -471,13 +566,15 @@ def update_labels_interactive():
 
         # Create template file
         print(f"\n📝 Creating template file: {template_file}")
-        create_template_file(current_labels, template_file)
+        create_template_file(current_labels, template_file, sorted_names)
         print(f"✓ Template created with suggestions")
     else:
         print(f"⏭️  Skipped generation. Using existing {template_file}")
         if not template_file.exists():
             print(f"⚠️  Warning: {template_file} not found. Creating it now...")
-            create_template_file(current_labels, template_file)
+            if not load_labels():
+                return 1
+            create_template_file(current_labels, template_file, sorted_names)
             print(f"✓ Template created")
 
     # STEP 3: Edit template
@@ -515,6 +612,10 @@ def update_labels_interactive():
         print("💡 You can edit 'label_updates.txt' and run this script again anytime.")
         return 0
 
+    # Labels are needed from here on to validate and apply the changes
+    if not load_labels():
+        return 1
+
     # Display the changes
     print("\n📋 Proposed Changes:")
     print("=" * 80)
@@ -525,6 +626,11 @@ def update_labels_interactive():
             print(f"⚠️  Label '{old_name}' not found on server (will be skipped)")
             continue
 
+        # Same name and the color it already has: not a change (as in apply_updates)
+        if new_name == old_name and (
+                color and COLOR_PALETTE[color] == current_labels[old_name].get('color')):
+            continue
+
         changes = []
         if new_name != old_name:
             changes.append(f"name: {old_name} → {new_name}")